@@ -0,0 +1,56 @@
+"""Décisions des ennemis réparties sur plusieurs pas de simulation
+
+Viser le joueur (direction de guidage des soldats, boxeurs et boss de l'easter egg)
+et décider de tirer (tanks, boss) coûtent une boucle Python ou des calculs par
+ennemi. Avec des centaines d'ennemis (niveau horde), un AIScheduler ne sert qu'au
+plus budget agents par pas, à tour de rôle dans l'ordre de l'essaim: chaque agent
+garde sa dernière direction visée jusqu'à son prochain tour. Le mouvement (guidage
+vers la direction gardée, déplacement, rebonds) reste calculé à chaque pas pour tous.
+
+Tant qu'il y a au plus budget agents (ou si budget vaut 0 ou moins), tous sont
+servis à chaque pas et le jeu est identique à une mise à jour complète. lag_steps /
+lag_ms disent de combien de pas (ms de jeu) la décision d'un agent peut dater: 0
+quand tout le monde est servi.
+
+	MMA_AI_BUDGET=16 MMA_HORDE_IMMORTAL=1 python headless.py --level horde --seconds 300
+"""
+import os
+import numpy as np
+
+# agents servis par pas de simulation (0 ou moins: tous, à chaque pas)
+BUDGET = int(os.environ.get("MMA_AI_BUDGET", "64"))
+
+
+class AIScheduler:
+	def __init__(self, budget=None):
+		self.budget = budget if budget is not None else BUDGET
+		# rang, parmi les agents, du premier servi au prochain pas
+		self.cursor = 0
+		self.agents = 0
+		self.served = 0
+		self.lag_steps = 0
+		self.lag_ms = 0.0
+
+	def select(self, swarm, dt):
+		"""Cases de l'essaim (croissantes) des agents servis à ce pas
+
+		Les agents sont les cibles vivantes qui cherchent le joueur ou peuvent tirer.
+		"""
+		n = len(swarm)
+		agents = np.flatnonzero(swarm.alive[:n] & (swarm.seeks_player[:n] | swarm.can_shoot[:n]))
+		count = len(agents)
+		everyone = self.budget <= 0 or count <= self.budget
+		if everyone:
+			self.cursor = 0
+			served = agents
+		else:
+			# des cibles retirées depuis le pas précédent décalent le tour de quelques rangs
+			start = self.cursor % count
+			served = agents[np.sort((start + np.arange(self.budget)) % count)]
+			self.cursor = (start + self.budget) % count
+		self.agents = count
+		self.served = len(served)
+		# pas nécessaires pour servir tous les agents, moins celui-ci
+		self.lag_steps = 0 if everyone else -(-count // self.budget) - 1
+		self.lag_ms = self.lag_steps * dt * 1000.0
+		return served
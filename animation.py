@@ -0,0 +1,103 @@
+"""Animations image par image (GIF) mises à l'échelle une seule fois par taille
+
+Un AnimatedSprite garde les frames décodées et leur durée (celle du GIF). Pour une
+taille donnée, toutes les frames sont mises à l'échelle d'un coup puis converties
+au format de l'écran; afficher l'animation ne coûte ensuite qu'un blit par frame.
+La frame affichée dépend du temps écoulé, pas du nombre d'images rendues.
+
+shared(name) renvoie une animation unique par GIF: ses frames mises à l'échelle
+servent à chaque affichage tant que la taille ne change pas.
+"""
+import bisect
+import pygame
+import asset_registry
+
+
+def _opaque(surf):
+	if not surf.get_flags() & pygame.SRCALPHA:
+		return surf.get_colorkey() is None
+	return int(pygame.surfarray.pixels_alpha(surf).min()) == 255
+
+
+class AnimatedSprite:
+	def __init__(self, frames, durations, smooth=True, loop=True):
+		if not frames:
+			raise ValueError("animation sans frame")
+		self.smooth = smooth
+		self.loop = loop
+		# frames consécutives identiques fusionnées: une surface, durées additionnées
+		self.frames = []
+		self.durations = []
+		previous = None
+		for frame, duration in zip(frames, durations):
+			data = pygame.image.tobytes(frame, 'RGBA')
+			if data == previous:
+				self.durations[-1] += duration
+				continue
+			previous = data
+			self.frames.append(frame)
+			self.durations.append(duration)
+		# fin de chaque frame (ms depuis le début de l'animation)
+		self.ends = []
+		total = 0
+		for duration in self.durations:
+			total += duration
+			self.ends.append(total)
+		self.total = total
+		# sans transparence, les frames mises à l'échelle sont stockées sans canal alpha
+		self.opaque = all(_opaque(f) for f in self.frames)
+		self.size = None
+		self.scaled = []
+
+	@classmethod
+	def from_gif(cls, name, **kwargs):
+		return cls(asset_registry.gif_frames(name), asset_registry.gif_durations(name), **kwargs)
+
+	def index_at(self, elapsed_ms):
+		"""Indice de la frame à afficher après elapsed_ms (la dernière reste si loop est faux)"""
+		if self.loop:
+			t = elapsed_ms % self.total
+		else:
+			t = min(elapsed_ms, self.total - 1)
+		return bisect.bisect_right(self.ends, t)
+
+	def prepare(self, size):
+		"""Mettre toutes les frames à la taille donnée (rien à faire si c'est déjà la taille courante)"""
+		size = (max(1, int(size[0])), max(1, int(size[1])))
+		if size == self.size:
+			return
+		# seule la taille courante est gardée: les frames de l'ancienne taille sont libérées
+		self.scaled = []
+		for frame in self.frames:
+			if self.smooth and frame.get_bitsize() >= 24:
+				surf = pygame.transform.smoothscale(frame, size)
+			else:
+				surf = pygame.transform.scale(frame, size)
+			if pygame.display.get_surface() is not None:
+				surf = surf.convert() if self.opaque else surf.convert_alpha()
+			self.scaled.append(surf)
+		self.size = size
+
+	def frame(self, elapsed_ms, size):
+		self.prepare(size)
+		return self.scaled[self.index_at(elapsed_ms)]
+
+	def draw(self, surface, elapsed_ms, pos=(0, 0), size=None):
+		"""Blitter la frame courante, étirée à size (toute la surface par défaut)"""
+		return surface.blit(self.frame(elapsed_ms, size or surface.get_size()), pos)
+
+	def memory_bytes(self):
+		return sum(s.get_pitch() * s.get_height() for s in self.scaled)
+
+
+# une animation par GIF, gardée pour toute la durée du jeu
+_shared = {}
+
+
+def shared(name, **kwargs):
+	"""AnimatedSprite du GIF name, construit au premier appel puis réutilisé"""
+	anim = _shared.get(name)
+	if anim is None:
+		anim = AnimatedSprite.from_gif(name, **kwargs)
+		_shared[name] = anim
+	return anim
@@ -0,0 +1,171 @@
+import threading
+import pygame
+from pathlib import Path
+import startup_trace
+
+ASSETS = Path(__file__).parent / "assets"
+
+# (nom, taille, lissage) -> Surface partagée
+_images = {}
+# nom -> liste de frames d'un GIF
+_gifs = {}
+# nom -> durée de chaque frame d'un GIF (ms)
+_gif_durations = {}
+# clés chargées avant l'ouverture de la fenêtre (ou par un thread de chargement), pas encore converties
+_unconverted = set()
+# les chargements peuvent venir d'un thread de préchargement (voir preloader)
+_lock = threading.RLock()
+
+
+def asset_name(name):
+	"""Nom de fichier relatif au dossier assets (accepte aussi un Path complet)"""
+	return Path(name).name
+
+
+def _display_ready():
+	return pygame.display.get_init() and pygame.display.get_surface() is not None
+
+
+def _can_convert():
+	# la conversion au format de l'écran est réservée au thread principal
+	return _display_ready() and threading.current_thread() is threading.main_thread()
+
+
+def _convert(surf):
+	# convertir au format de l'écran pour que les blits n'aient plus de conversion à faire
+	if not _can_convert():
+		return surf
+	if surf.get_flags() & pygame.SRCALPHA or surf.get_colorkey() is not None:
+		return surf.convert_alpha()
+	return surf.convert()
+
+
+def _scale(surf, size, smooth):
+	if smooth and surf.get_bitsize() >= 24:
+		return pygame.transform.smoothscale(surf, size)
+	return pygame.transform.scale(surf, size)
+
+
+def image(name, size=None, smooth=False):
+	"""Surface partagée pour un asset, chargée et convertie une seule fois par (nom, taille, filtre)
+
+	Les surfaces renvoyées sont partagées: les copier avant de les modifier.
+	Appelée hors du thread principal, décode sans convertir (voir convert_pending).
+	"""
+	name = asset_name(name)
+	if size is not None:
+		size = (int(size[0]), int(size[1]))
+	key = (name, size, smooth if size else False)
+	with _lock:
+		surf = _images.get(key)
+		if surf is not None:
+			return surf
+
+		if size is None:
+			with startup_trace.span(f"image {name}"):
+				surf = pygame.image.load(str(ASSETS / name))
+		else:
+			source = image(name)
+			with startup_trace.span(f"image {name} {size[0]}x{size[1]}"):
+				surf = _scale(source, size, smooth)
+		if _can_convert():
+			surf = _convert(surf)
+		else:
+			_unconverted.add(key)
+		_images[key] = surf
+		return surf
+
+
+def gif_frames(name):
+	"""Toutes les frames d'un GIF animé, décodées via PIL une seule fois"""
+	from PIL import Image
+
+	name = asset_name(name)
+	with _lock:
+		frames = _gifs.get(name)
+		if frames is not None:
+			return frames
+
+		frames = []
+		durations = []
+		with startup_trace.span(f"gif {name}"):
+			gif = Image.open(str(ASSETS / name))
+			for frame_idx in range(gif.n_frames):
+				gif.seek(frame_idx)
+				# durée absente ou nulle: 100 ms, comme les navigateurs
+				durations.append(gif.info.get('duration') or 100)
+				frame = gif.convert('RGBA')
+				pygame_image = pygame.image.fromstring(frame.tobytes(), frame.size, frame.mode)
+				frames.append(_convert(pygame_image))
+		if not _can_convert():
+			_unconverted.add(name)
+		_gif_durations[name] = durations
+		_gifs[name] = frames
+		return frames
+
+
+def gif_durations(name):
+	"""Durée d'affichage (ms) de chaque frame d'un GIF, lue par PIL avec les frames"""
+	name = asset_name(name)
+	with _lock:
+		if name not in _gif_durations:
+			gif_frames(name)
+		return _gif_durations[name]
+
+
+def convert_pending():
+	"""Convertir les surfaces chargées avant l'ouverture de la fenêtre ou par un autre thread"""
+	if not _can_convert():
+		return
+	with _lock:
+		for key in list(_unconverted):
+			if key in _images:
+				_images[key] = _convert(_images[key])
+			elif key in _gifs:
+				_gifs[key] = [_convert(f) for f in _gifs[key]]
+		_unconverted.clear()
+
+
+def surface_bytes(surf):
+	return surf.get_pitch() * surf.get_height()
+
+
+def report():
+	"""Liste (clé, taille en pixels, octets) de tout ce qui est chargé"""
+	entries = []
+	for (name, size, smooth), surf in _images.items():
+		label = name if size is None else f"{name}@{size[0]}x{size[1]}"
+		entries.append((label, surf.get_size(), surface_bytes(surf)))
+	for name, frames in _gifs.items():
+		total = sum(surface_bytes(f) for f in frames)
+		entries.append((f"{name}[{len(frames)}]", frames[0].get_size() if frames else (0, 0), total))
+	return entries
+
+
+def total_bytes():
+	return sum(entry[2] for entry in report())
+
+
+def print_report():
+	for label, (w, h), nbytes in sorted(report(), key=lambda e: -e[2]):
+		print(f"{label:<40} {w:>5}x{h:<5} {nbytes / 1024:>10.1f} Kio")
+	print(f"{'TOTAL':<40} {'':>11} {total_bytes() / 1024:>10.1f} Kio")
+
+
+def clear():
+	_images.clear()
+	_gifs.clear()
+	_gif_durations.clear()
+	_unconverted.clear()
+
+
+if __name__ == "__main__":
+	# python asset_registry.py : charger toutes les images et afficher l'occupation mémoire
+	pygame.display.init()
+	pygame.display.set_mode((1, 1), pygame.HIDDEN)
+	for path in sorted(ASSETS.iterdir()):
+		if path.suffix.lower() == ".gif":
+			gif_frames(path.name)
+		elif path.suffix.lower() in (".png", ".jpg"):
+			image(path.name)
+	print_report()
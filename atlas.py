@@ -0,0 +1,169 @@
+"""Planche de sprites: les petites images du HUD et des tirs dans une seule surface
+
+Les balles, poings, marqueurs de coup, cœurs et balles spéciales sont rangés une fois
+pour toutes dans une surface convertie. Chaque image devient un AtlasSprite (la planche
+et un rectangle); une SpriteBatch dessine une suite d'images avec un seul Surface.blits(),
+en mélangeant si besoin sprites de la planche et surfaces ordinaires.
+"""
+import math
+import pygame
+import asset_registry
+
+# clé -> (fichier, taille) des images rangées dans la planche par défaut
+SPRITES = {
+	"balle": ("balle.png", (24, 24)),
+	"poing": ("poing.png", (32, 32)),
+	"hit": ("hit.png", (100, 100)),
+	"spe": ("spe.png", (48, 48)),
+	# HUD (bsd.BSD)
+	"hp": ("hp.png", (50, 50)),
+	"mihp": ("mihp.png", (50, 50)),
+	"balle_hud": ("balle.png", (28, 28)),
+}
+
+
+class AtlasSprite:
+	"""Une image de la planche: même interface de taille qu'une Surface"""
+	__slots__ = ('atlas', 'area')
+
+	def __init__(self, atlas, area):
+		self.atlas = atlas
+		self.area = area
+
+	def get_size(self):
+		return self.area.size
+
+	def get_width(self):
+		return self.area.width
+
+	def get_height(self):
+		return self.area.height
+
+	def get_rect(self, **kwargs):
+		rect = pygame.Rect((0, 0), self.area.size)
+		for name, value in kwargs.items():
+			setattr(rect, name, value)
+		return rect
+
+
+class SpriteAtlas:
+	def __init__(self, padding=1):
+		# marge transparente entre deux images (pixels)
+		self.padding = padding
+		self.images = {}
+		self.sprites = {}
+		self.surface = None
+		self.converted = False
+
+	def add(self, key, surface):
+		if self.surface is not None:
+			raise ValueError("planche déjà construite")
+		self.images[key] = surface
+
+	def build(self):
+		"""Ranger les images par étagères (les plus hautes d'abord) dans une seule surface"""
+		pad = self.padding
+		order = sorted(self.images, key=lambda k: (-self.images[k].get_height(), k))
+		area = sum((s.get_width() + pad) * (s.get_height() + pad) for s in self.images.values())
+		widest = max((s.get_width() + pad for s in self.images.values()), default=1)
+		width = max(widest, int(math.ceil(math.sqrt(area))))
+		x = y = shelf = 0
+		places = {}
+		for key in order:
+			w, h = self.images[key].get_size()
+			if x + w + pad > width:
+				x = 0
+				y += shelf
+				shelf = 0
+			places[key] = pygame.Rect(x, y, w, h)
+			x += w + pad
+			shelf = max(shelf, h + pad)
+		self.surface = pygame.Surface((width, max(1, y + shelf)), pygame.SRCALPHA)
+		self.surface.fill((0, 0, 0, 0))
+		for key, rect in places.items():
+			# copie exacte des pixels (un blit normal mélangerait l'alpha avec le fond transparent)
+			self.surface.blit(self.images[key], rect, special_flags=pygame.BLEND_RGBA_MAX)
+			self.sprites[key] = AtlasSprite(self, rect)
+		# les images d'origine restent dans le registre d'assets
+		self.images = {}
+		self.convert()
+		return self
+
+	def convert(self):
+		"""Convertir la planche au format de l'écran (dès qu'une fenêtre existe)"""
+		if not self.converted and pygame.display.get_surface() is not None:
+			self.surface = self.surface.convert_alpha()
+			self.converted = True
+
+	def __getitem__(self, key):
+		return self.sprites[key]
+
+	def __contains__(self, key):
+		return key in self.sprites
+
+
+class SpriteBatch:
+	"""Blits d'une frame accumulés puis envoyés en un seul Surface.blits()
+
+	L'ordre d'ajout est l'ordre de dessin; sprites de la planche et surfaces
+	ordinaires peuvent être mélangés.
+	"""
+
+	def __init__(self, target):
+		self.target = target
+		self.seq = []
+		self.rects = []
+
+	def blit(self, image, pos):
+		if isinstance(image, AtlasSprite):
+			self.seq.append((image.atlas.surface, pos, image.area))
+		else:
+			self.seq.append((image, pos))
+
+	def blit_centered(self, image, x, y):
+		w, h = image.get_size()
+		self.blit(image, (int(x - w // 2), int(y - h // 2)))
+
+	def circle(self, color, center, radius):
+		# dessiné tout de suite: vider d'abord ce qui doit passer dessous
+		self._send()
+		self.rects.append(pygame.draw.circle(self.target, color, center, radius))
+
+	def _send(self):
+		if self.seq:
+			self.rects.extend(self.target.blits(self.seq))
+			self.seq = []
+
+	def flush(self):
+		"""Dessiner ce qui reste; renvoie les rectangles modifiés depuis le début"""
+		self._send()
+		rects = self.rects
+		self.rects = []
+		return rects
+
+
+_default = None
+
+
+def build_default():
+	atlas = SpriteAtlas()
+	for key, (name, size) in SPRITES.items():
+		atlas.add(key, asset_registry.image(name, size))
+	# emplacement de munition vide: balle du HUD assombrie
+	empty = asset_registry.image(*SPRITES["balle_hud"]).copy()
+	empty.fill((100, 100, 100), special_flags=pygame.BLEND_RGBA_MULT)
+	atlas.add("balle_hud_vide", empty)
+	return atlas.build()
+
+
+def sprites():
+	"""Planche par défaut, construite au premier appel"""
+	global _default
+	if _default is None:
+		_default = build_default()
+	_default.convert()
+	return _default
+
+
+def get(key):
+	return sprites()[key]
@@ -0,0 +1,202 @@
+"""Parties sans affichage en grand nombre, réparties sur tous les cœurs, jouées par un bot
+
+	python batch.py --levels 1 2 3 egg --runs 500 --seconds 180
+	python batch.py --levels 3 --runs 2000 --jobs 8 --json runs.json
+
+Chaque partie (niveau, graine) est simulée une fois par headless.run, du début jusqu'à
+la victoire, la défaite ou la limite de temps, par un processus du pool. Le Bot vise la
+cible vivante la plus proche, tire au rythme de fire_interval en respectant les munitions
+et le rechargement du joueur (BSD), et se décale pour éviter les balles ennemies et les
+soldats au contact. Chaque processus renvoie quelques nombres par partie; le résumé
+donne leur distribution par niveau.
+"""
+import headless  # configure SDL en mode sans affichage avant pygame
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+import numpy as np
+import pygame
+import input_source
+from bullet_pool import ALIVE, OWNERS, BulletPool
+from swarm import TargetSwarm
+
+ENEMY = OWNERS.index('enemy')
+
+
+class Bot:
+	"""Joueur scripté: fournit la souris (visée) et le clavier (esquive) de headless.run"""
+	# une balle qui atteint la hauteur du joueur dans ce délai (s) est une menace
+	HORIZON = 0.8
+	# marge (px) autour du joueur pour les balles et les soldats
+	MARGIN = 30
+	# distance (px) à partir de laquelle un soldat qui cherche le joueur fait reculer
+	CONTACT = 150
+
+	def __init__(self, game, get_level):
+		self.game = game
+		self.get_level = get_level
+		self.idle = input_source.PressedKeys()
+		self.left = input_source.PressedKeys([pygame.K_LEFT])
+		self.right = input_source.PressedKeys([pygame.K_RIGHT])
+
+	def _live_targets(self, targets):
+		"""(x, y, cherche le joueur) des cibles vivantes"""
+		if isinstance(targets, TargetSwarm):
+			n = len(targets)
+			idx = np.flatnonzero(targets.alive[:n])
+			return targets.x[idx], targets.y[idx], targets.seeks_player[idx]
+		live = [t for t in targets if t.alive]
+		return (np.array([t.x for t in live]), np.array([t.y for t in live]),
+			np.array([t.seeks_player for t in live], dtype=bool))
+
+	def mouse(self):
+		"""Viser la cible vivante la plus proche du joueur"""
+		rect = self.game.player_rect
+		x, y, _ = self._live_targets(self.get_level().targets)
+		if not len(x):
+			return (rect.centerx, 0)
+		i = int(np.argmin((x - rect.centerx) ** 2 + (y - rect.centery) ** 2))
+		return (int(x[i]), int(y[i]))
+
+	def _threat_x(self):
+		"""Abscisse où passera la balle ennemie la plus pressante au niveau du joueur, ou None"""
+		bullets = self.get_level().bullets
+		rect = self.game.player_rect
+		if isinstance(bullets, BulletPool):
+			sel = np.flatnonzero(((bullets.flags & ALIVE) != 0) & (bullets.owner == ENEMY))
+			bx, by = bullets.x[sel], bullets.y[sel]
+			vx, vy = bullets.dx[sel] * bullets.speed[sel], bullets.dy[sel] * bullets.speed[sel]
+		else:
+			live = [b for b in bullets if b.alive and b.owner == 'enemy']
+			bx = np.array([b.x for b in live])
+			by = np.array([b.y for b in live])
+			vx = np.array([b.dx * b.speed for b in live])
+			vy = np.array([b.dy * b.speed for b in live])
+		down = vy > 0
+		if not down.any():
+			return None
+		bx, by, vx, vy = bx[down], by[down], vx[down], vy[down]
+		t = (rect.top - by) / vy
+		x_at = bx + vx * t
+		danger = (t > -0.1) & (t < self.HORIZON) & (np.abs(x_at - rect.centerx) < rect.width / 2 + self.MARGIN)
+		if not danger.any():
+			return None
+		return float(x_at[danger][np.argmin(t[danger])])
+
+	def keys(self):
+		"""Se décaler du côté opposé à la menace la plus proche (balle, puis soldat au contact)"""
+		rect = self.game.player_rect
+		threat = self._threat_x()
+		if threat is None:
+			x, y, seeks = self._live_targets(self.get_level().targets)
+			near = seeks & ((x - rect.centerx) ** 2 + (y - rect.centery) ** 2 < self.CONTACT ** 2)
+			if not near.any():
+				return self.idle
+			threat = float(x[near][np.argmin(np.abs(x[near] - rect.centerx))])
+		width = self.game.screen.get_width()
+		go_left = threat >= rect.centerx
+		# contre un bord: partir de l'autre côté
+		if go_left and rect.left <= 0:
+			go_left = False
+		elif not go_left and rect.right >= width:
+			go_left = True
+		return self.left if go_left else self.right
+
+
+def play(args):
+	"""Une partie (niveau, graine, durée max, intervalle de tir); renvoie ses statistiques"""
+	level, seed, seconds, fire_interval = args
+	stats = headless.run(headless.LEVELS[level], seconds, seed=seed, fire_interval=fire_interval,
+		restart=False, bot=Bot)
+	return {
+		"level": level,
+		"seed": seed,
+		"cleared": stats["clears"] > 0,
+		"dead": stats["deaths"] > 0,
+		"clear_time": stats["clear_times"][0] if stats["clear_times"] else None,
+		"hits": stats["hits"],
+		"shots": stats["shots"],
+		"ticks": stats["ticks"],
+		"ticks_per_second": stats["ticks_per_second"],
+	}
+
+
+def distribution(values):
+	"""Nombre, moyenne et quantiles d'une liste de nombres"""
+	if not values:
+		return {"n": 0}
+	v = np.asarray(values, dtype=float)
+	p10, p50, p90 = np.percentile(v, [10, 50, 90])
+	return {"n": len(v), "mean": float(v.mean()), "min": float(v.min()), "p10": float(p10),
+		"p50": float(p50), "p90": float(p90), "max": float(v.max())}
+
+
+def summarize(runs):
+	"""Distributions par niveau (temps de victoire, coups reçus, tirs, pas/s)"""
+	summary = {}
+	for level in sorted({r["level"] for r in runs}):
+		mine = [r for r in runs if r["level"] == level]
+		summary[level] = {
+			"runs": len(mine),
+			"clear_rate": sum(r["cleared"] for r in mine) / len(mine),
+			"death_rate": sum(r["dead"] for r in mine) / len(mine),
+			"clear_time": distribution([r["clear_time"] for r in mine if r["cleared"]]),
+			"hits": distribution([r["hits"] for r in mine]),
+			"shots": distribution([r["shots"] for r in mine]),
+			"ticks_per_second": distribution([r["ticks_per_second"] for r in mine]),
+		}
+	return summary
+
+
+def run_batch(levels, runs, seconds, fire_interval=0.15, jobs=None, first_seed=0):
+	"""Simuler runs parties par niveau sur jobs processus; renvoie la liste des statistiques"""
+	jobs = jobs or os.cpu_count()
+	tasks = [(level, first_seed + i, seconds, fire_interval) for level in levels for i in range(runs)]
+	pool = multiprocessing.Pool(jobs)
+	try:
+		# des paquets de quelques parties: moins d'allers-retours, charge encore équilibrée
+		results = pool.imap_unordered(play, tasks, chunksize=max(1, len(tasks) // (8 * jobs)))
+		return sorted(results, key=lambda r: (r["level"], r["seed"]))
+	finally:
+		# pas de terminate() (sortie d'un with): SDL intercepte SIGTERM dans les processus
+		# qui ont initialisé pygame, ils ne s'arrêteraient pas
+		pool.close()
+		pool.join()
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	# la horde ne se termine jamais: seulement si on la demande
+	parser.add_argument("--levels", nargs="+", choices=sorted(headless.LEVELS),
+		default=[name for name in sorted(headless.LEVELS) if name != "horde"])
+	parser.add_argument("--runs", type=int, default=100, help="parties par niveau")
+	parser.add_argument("--seconds", type=float, default=180.0, help="durée maximale d'une partie")
+	parser.add_argument("--fire-interval", type=float, default=0.15, help="secondes entre deux tirs du bot")
+	parser.add_argument("--jobs", type=int, default=None, help="processus (par défaut: un par cœur)")
+	parser.add_argument("--seed", type=int, default=0, help="graine de la première partie")
+	parser.add_argument("--json", help="écrire les parties et le résumé dans ce fichier")
+	args = parser.parse_args(argv)
+
+	start = time.perf_counter()
+	runs = run_batch(args.levels, args.runs, args.seconds, args.fire_interval, args.jobs, args.seed)
+	wall = time.perf_counter() - start
+	summary = summarize(runs)
+
+	print(f"{len(runs)} parties en {wall:.1f} s ({args.jobs or os.cpu_count()} processus)")
+	for level, s in summary.items():
+		print(f"niveau {level}: {s['runs']} parties, victoires {s['clear_rate']:.0%}, défaites {s['death_rate']:.0%}")
+		for name in ("clear_time", "hits", "shots", "ticks_per_second"):
+			d = s[name]
+			if d["n"]:
+				print(f"  {name:<17} p10 {d['p10']:>8.1f}  p50 {d['p50']:>8.1f}  p90 {d['p90']:>8.1f}  "
+					f"(min {d['min']:.1f}, max {d['max']:.1f})")
+	if args.json:
+		with open(args.json, "w") as f:
+			json.dump({"runs": runs, "summary": summary}, f, indent=1)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,161 @@
+"""Micro-benchmarks des boucles de mise à jour des niveaux
+
+	python bench.py --out bench.json
+	python bench.py --compare bench.json --threshold 0.15
+
+Pour chaque classe de niveau et chaque taille (nombre de cibles et de balles), mesure
+le temps par pas de update(), des collisions seules (hit_targets / hit_player) et du
+guidage des cibles (TargetSwarm.step). Les résultats sont écrits en JSON; --compare
+signale les régressions par rapport à un fichier de référence (code de sortie 1).
+"""
+import headless  # configure SDL en mode sans affichage avant pygame
+
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import level1
+import sim_time
+from bsd import BSD
+
+SIZES = [10, 100, 1000, 10000]
+DT = 0.016
+
+
+def build_scenario(level_cls, n_targets, n_bullets, seed=0):
+	"""Niveau peuplé de n_targets cibles et n_bullets balles, toujours identique pour une graine donnée"""
+	random.seed(seed)
+	sim_time.reset()
+	screen = headless.init_display()
+	w, h = screen.get_size()
+	player = BSD(screen)
+	player.center_player()
+	level = level_cls(screen)
+	level.targets.clear()
+	level.bullets.clear()
+	for i in range(n_targets):
+		shooter = i % 10 == 0
+		t = level1.Target(random.uniform(40, w - 40), random.uniform(40, h * 0.6), hp=10 ** 9,
+			radius=random.choice((28, 36, 40)), seeks_player=not shooter, touch_damage=0.5, can_shoot=shooter)
+		t.steer_strength = random.uniform(30, 50)
+		# attributs posés par les spawn_targets des niveaux 3 et easter egg
+		t.first_shot_done = False
+		t.shoot_cooldown = 800
+		t.last_shot = sim_time.get_ticks()
+		level.targets.append(t)
+	for i in range(n_bullets):
+		owner = 'enemy' if i % 4 == 0 else 'player'
+		angle = random.uniform(0, 2 * math.pi)
+		level.bullets.spawn(random.uniform(0, w), random.uniform(0, h), math.cos(angle), math.sin(angle), owner=owner)
+	# les dégâts au joueur ne doivent pas interrompre la mesure
+	player.half_lives = 10 ** 9
+	return level, player
+
+
+def _update(level, player):
+	level.update(DT, player)
+
+
+def _collisions(level, player):
+	level.broadphase.rebuild(level.targets, level.bullets)
+	level.hit_targets()
+	level.hit_player(player)
+
+
+def _steering(level, player):
+	w, h = level.screen.get_size()
+	level.targets.step(DT, w, h, player.player_rect.centerx, player.player_rect.centery)
+
+
+CASES = {
+	"update": _update,
+	"collisions": _collisions,
+	"steering": _steering,
+}
+
+
+def measure(fn, level_cls, n, repeat=3, min_time=0.2, max_ticks=200):
+	"""Temps par pas (ms): meilleur et médiane sur repeat scénarios neufs"""
+	samples = []
+	ticks = 0
+	for r in range(repeat):
+		level, player = build_scenario(level_cls, n, n, seed=r)
+		ticks = 0
+		elapsed = 0.0
+		while ticks < max_ticks and (ticks == 0 or elapsed < min_time):
+			sim_time.advance(DT)
+			start = time.perf_counter()
+			fn(level, player)
+			elapsed += time.perf_counter() - start
+			ticks += 1
+		samples.append(elapsed / ticks * 1000.0)
+	return {"median_ms": statistics.median(samples), "min_ms": min(samples), "ticks": ticks, "repeat": repeat}
+
+
+def run(levels, sizes, cases, repeat):
+	results = {}
+	for name in levels:
+		level_cls = headless.LEVELS[name]
+		for case in cases:
+			for n in sizes:
+				key = f"{level_cls.__name__}/{case}/{n}"
+				results[key] = measure(CASES[case], level_cls, n, repeat=repeat)
+				print(f"{key:<32} {results[key]['median_ms']:>10.3f} ms/pas", file=sys.stderr)
+	return {
+		"meta": {
+			"python": platform.python_version(),
+			"platform": platform.platform(),
+			"time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+		},
+		"results": results,
+	}
+
+
+def compare(current, baseline, threshold):
+	"""Afficher l'écart avec la référence; renvoie la liste des clés en régression"""
+	regressions = []
+	for key, res in sorted(current["results"].items()):
+		base = baseline["results"].get(key)
+		if base is None:
+			print(f"{key:<32} {res['median_ms']:>10.3f} ms  (nouveau)")
+			continue
+		ratio = res["median_ms"] / base["median_ms"] if base["median_ms"] > 0 else float("inf")
+		flag = ""
+		if ratio > 1.0 + threshold:
+			flag = "REGRESSION"
+			regressions.append(key)
+		print(f"{key:<32} {res['median_ms']:>10.3f} ms  x{ratio:.2f}  {flag}")
+	return regressions
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--levels", default="1,2,3,egg", help="niveaux à mesurer (1,2,3,egg,horde)")
+	parser.add_argument("--sizes", default=",".join(str(n) for n in SIZES), help="nombres de cibles et de balles")
+	parser.add_argument("--cases", default=",".join(CASES), help="mesures: " + ", ".join(CASES))
+	parser.add_argument("--repeat", type=int, default=3)
+	parser.add_argument("--out", help="écrire les résultats JSON dans ce fichier")
+	parser.add_argument("--compare", help="fichier JSON de référence")
+	parser.add_argument("--threshold", type=float, default=0.15, help="ralentissement toléré (0.15 = 15 %%)")
+	args = parser.parse_args(argv)
+
+	current = run(args.levels.split(","), [int(n) for n in args.sizes.split(",")], args.cases.split(","), args.repeat)
+	if args.out:
+		with open(args.out, "w") as f:
+			json.dump(current, f, indent=2)
+	elif not args.compare:
+		print(json.dumps(current, indent=2))
+
+	if args.compare:
+		with open(args.compare) as f:
+			baseline = json.load(f)
+		if compare(current, baseline, args.threshold):
+			sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
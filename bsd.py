@@ -1,24 +1,20 @@
 import pygame
 from pathlib import Path
+import asset_registry
+import atlas
+import input_source
+import sound_bank
 
 ASSETS = Path(__file__).parent / "assets"
 
-# Initialiser le mixer pour les sons
-pygame.mixer.init()
-
 
 class BSD:
-	# variable de classe pour le son de l'arme
-	gun_sound = None
-	
 	def __init__(self, screen):
 		self.screen = screen
-		self.player_img_original = pygame.image.load(str(ASSETS / "joueur.png"))
-		self.player_img_original = pygame.transform.scale(self.player_img_original, (128, 128))
+		self.player_img_original = asset_registry.image("joueur.png", (128, 128))
 		self.player_img = self.player_img_original.copy()
 		
-		self.player_hit_img_original = pygame.image.load(str(ASSETS / "persotouche.png"))
-		self.player_hit_img_original = pygame.transform.scale(self.player_hit_img_original, (128, 128))
+		self.player_hit_img_original = asset_registry.image("persotouche.png", (128, 128))
 		self.player_hit_img = self.player_hit_img_original.copy()
 		
 		self.player_rect = self.player_img.get_rect()
@@ -26,7 +22,7 @@ class BSD:
 		self.is_hit = False
 		self.hit_timer = 0.0
 		self.speed = 400
-		self.keys_pressed = pygame.key.get_pressed()
+		self.keys_pressed = input_source.get_pressed()
 		self.update_position()
 
 		self.half_lives = 6
@@ -36,25 +32,14 @@ class BSD:
 		self.reload_time = 1.5
 		self.reload_remaining = 0.0
 
-		self.hp_img = pygame.image.load(str(ASSETS / "hp.png"))
-		self.hp_img = pygame.transform.scale(self.hp_img, (50, 50))
-		self.mihp_img = pygame.image.load(str(ASSETS / "mihp.png"))
-		self.mihp_img = pygame.transform.scale(self.mihp_img, (50, 50))
-		
-		self.balle_img = pygame.image.load(str(ASSETS / "balle.png"))
-		self.balle_img = pygame.transform.scale(self.balle_img, (28, 28))
-		
-		balle = pygame.image.load(str(ASSETS / "balle.png"))
-		balle = pygame.transform.scale(balle, (28, 28))
-		self.balle_empty_img = balle.copy()
-		self.balle_empty_img.fill((100, 100, 100), special_flags=pygame.BLEND_RGBA_MULT)
+		# images du HUD, rangées dans la planche de sprites (voir atlas)
+		self.hp_img = atlas.get("hp")
+		self.mihp_img = atlas.get("mihp")
 		
-		if BSD.gun_sound is None:
-			BSD.gun_sound = pygame.mixer.Sound(str(ASSETS / "GUNPis_Coup de feu de 357 magnum 9 mm (ID 0438)_LaSonotheque.fr.mp3"))
-			BSD.gun_sound.set_volume(0.3)
+		self.balle_img = atlas.get("balle_hud")
 		
-		self.reload_sound = pygame.mixer.Sound(str(ASSETS / "reload.mp3"))
-		self.reload_sound.set_volume(0.4)
+		# balle assombrie, préparée une fois dans la planche
+		self.balle_empty_img = atlas.get("balle_hud_vide")
 
 	def update_position(self):
 		w, h = self.screen.get_size()
@@ -65,6 +50,8 @@ class BSD:
 		w, h = self.screen.get_size()
 		self.player_rect.centerx = w // 2
 		self.player_rect.midbottom = (w // 2, h)
+		# pas d'interpolation du rendu depuis l'ancienne position
+		self.prev_rect_x = self.player_rect.x
 
 	def handle_event(self, event):
 		if event.type == pygame.VIDEORESIZE:
@@ -75,10 +62,8 @@ class BSD:
 			if getattr(event, 'button', 1) == 1:
 				if not self.reloading and self.ammo > 0:
 					self.ammo -= 1
-					# jouer le son de l'arme (arrêter le précédent s'il joue)
-					if BSD.gun_sound:
-						BSD.gun_sound.stop()
-						BSD.gun_sound.play()
+					# jouer le son de l'arme (une seule voix: coupe le précédent s'il joue)
+					sound_bank.play("gun")
 					# démarrer le rechargement automatique quand les munitions sont épuisées
 					if self.ammo <= 0:
 						self.start_reload()
@@ -96,19 +81,18 @@ class BSD:
 		self.reloading = True
 		self.reload_remaining = self.reload_time
 		# jouer le son de rechargement
-		if hasattr(self, 'reload_sound') and self.reload_sound:
-			self.reload_sound.play()
+		sound_bank.play("reload")
 	
 	def take_hit(self):
 		self.is_hit = True
 		self.hit_timer = 0.5
-		roblox_sound = pygame.mixer.Sound(str(ASSETS / "roblox-death-sound-effect.mp3"))
-		roblox_sound.set_volume(1.5)
-		roblox_sound.play()
+		sound_bank.play("hit")
 
 	def update(self, dt):
-		keys = pygame.key.get_pressed()
+		keys = input_source.get_pressed()
 		w, h = self.screen.get_size()
+		# position au pas précédent, pour interpoler le rendu
+		self.prev_rect_x = self.player_rect.x
 		
 		# Mettre à jour le timer de l'état touché
 		if self.is_hit:
@@ -142,6 +126,6 @@ class BSD:
 
 	def draw(self):
 		if self.is_hit and self.player_hit_img:
-			self.screen.blit(self.player_hit_img, self.player_rect)
+			return self.screen.blit(self.player_hit_img, self.player_rect)
 		else:
-			self.screen.blit(self.player_img, self.player_rect)
+			return self.screen.blit(self.player_img, self.player_rect)
@@ -0,0 +1,306 @@
+"""Stockage des balles en tableaux NumPy (une colonne par attribut)
+
+Au lieu d'un objet Python par tir, chaque balle occupe un emplacement (slot) des
+tableaux x, y, dx, dy, speed, radius, owner et flags. Les emplacements libérés sont
+réutilisés; la capacité double quand ils sont tous pris. Le déplacement, le retrait
+des balles sorties de l'écran et les tests de contact se font en une opération
+sur tous les emplacements.
+
+Pour le reste du code, le pool se comporte comme la liste de balles d'avant:
+on l'itère (dans l'ordre des tirs), on en prend la longueur, et chaque balle est
+une BulletView qui expose x, y, owner, alive, is_special, custom_image...
+"""
+import numpy as np
+
+OWNERS = ('player', 'enemy')
+
+# bits de flags
+USED = 1
+ALIVE = 2
+SPECIAL = 4
+
+# vitesses par défaut selon le propriétaire (comme level1.Bullet)
+DEFAULT_SPEED = {'player': 600, 'enemy': 400}
+DEFAULT_RADIUS = 4
+
+# nombre maximal de paires candidates examinées d'un coup par overlap_circles
+CHUNK = 1 << 20
+
+
+def _column(name):
+	"""Propriété lisant / écrivant la case de la balle dans le tableau name du pool"""
+	def get(self):
+		return getattr(self.pool, name)[self.slot]
+
+	def set(self, value):
+		getattr(self.pool, name)[self.slot] = value
+	return property(get, set)
+
+
+class BulletView:
+	"""Une balle du pool, vue comme un objet (valide jusqu'à sa libération)"""
+	__slots__ = ('pool', 'slot')
+
+	def __init__(self, pool, slot):
+		self.pool = pool
+		self.slot = slot
+
+	x = _column('x')
+	y = _column('y')
+	dx = _column('dx')
+	dy = _column('dy')
+	speed = _column('speed')
+	radius = _column('radius')
+	prev_x = _column('prev_x')
+	prev_y = _column('prev_y')
+
+	@property
+	def owner(self):
+		return OWNERS[self.pool.owner[self.slot]]
+
+	@owner.setter
+	def owner(self, value):
+		self.pool.owner[self.slot] = OWNERS.index(value)
+
+	@property
+	def alive(self):
+		return bool(self.pool.flags[self.slot] & ALIVE)
+
+	@alive.setter
+	def alive(self, value):
+		self.pool._set_flag(self.slot, ALIVE, value)
+
+	@property
+	def is_special(self):
+		return bool(self.pool.flags[self.slot] & SPECIAL)
+
+	@is_special.setter
+	def is_special(self, value):
+		self.pool._set_flag(self.slot, SPECIAL, value)
+
+	@property
+	def custom_image(self):
+		return self.pool.images[self.slot]
+
+	@custom_image.setter
+	def custom_image(self, value):
+		self.pool.images[self.slot] = value
+
+	def update(self, dt, *_args, **_kwargs):
+		self.x += self.dx * self.speed * dt
+		self.y += self.dy * self.speed * dt
+
+
+class BulletPool:
+	def __init__(self, capacity=64):
+		self.capacity = 0
+		self.x = np.zeros(0)
+		self.y = np.zeros(0)
+		self.dx = np.zeros(0)
+		self.dy = np.zeros(0)
+		self.speed = np.zeros(0)
+		self.radius = np.zeros(0)
+		self.prev_x = np.zeros(0)
+		self.prev_y = np.zeros(0)
+		self.owner = np.zeros(0, dtype=np.int8)
+		self.flags = np.zeros(0, dtype=np.uint8)
+		# numéro de tir croissant: sert à itérer dans l'ordre d'apparition malgré la réutilisation des slots
+		self.serial = np.zeros(0, dtype=np.int64)
+		self.images = []
+		self.views = []
+		self.free = []
+		self.next_serial = 0
+		self.count = 0
+		# slots utilisés, dans l'ordre des tirs (None: à recalculer)
+		self._order = None
+		self._grow(capacity)
+
+	def _grow(self, capacity):
+		old = self.capacity
+		for name in ('x', 'y', 'dx', 'dy', 'speed', 'radius', 'prev_x', 'prev_y', 'owner', 'flags', 'serial'):
+			arr = getattr(self, name)
+			grown = np.zeros(capacity, dtype=arr.dtype)
+			grown[:old] = arr
+			setattr(self, name, grown)
+		self.images.extend([None] * (capacity - old))
+		self.views.extend([None] * (capacity - old))
+		# les slots les plus bas sont distribués en premier
+		self.free.extend(range(capacity - 1, old - 1, -1))
+		self.capacity = capacity
+
+	def _set_flag(self, slot, bit, value):
+		if value:
+			self.flags[slot] |= bit
+		else:
+			self.flags[slot] &= ~np.uint8(bit)
+
+	def spawn(self, x, y, dx, dy, speed=None, owner='player', custom_image=None, is_special=False):
+		"""Ajouter une balle de direction (dx, dy) et renvoyer sa vue"""
+		if not self.free:
+			# plus de slot libre: doubler la capacité plutôt que de perdre le tir
+			self._grow(max(1, self.capacity * 2))
+		slot = self.free.pop()
+		if speed is None:
+			speed = DEFAULT_SPEED[owner]
+		self.x[slot] = self.prev_x[slot] = x
+		self.y[slot] = self.prev_y[slot] = y
+		self.dx[slot] = dx
+		self.dy[slot] = dy
+		self.speed[slot] = speed
+		self.radius[slot] = DEFAULT_RADIUS
+		self.owner[slot] = OWNERS.index(owner)
+		self.flags[slot] = USED | ALIVE | (SPECIAL if is_special else 0)
+		self.serial[slot] = self.next_serial
+		self.next_serial += 1
+		self.images[slot] = custom_image
+		view = BulletView(self, slot)
+		self.views[slot] = view
+		self.count += 1
+		self._order = None
+		return view
+
+	def append(self, bullet):
+		"""Copier dans le pool un objet du genre level1.Bullet (pour le code qui en construit encore)"""
+		view = self.spawn(bullet.x, bullet.y, bullet.dx, bullet.dy, speed=bullet.speed,
+			owner=getattr(bullet, 'owner', 'player'), custom_image=getattr(bullet, 'custom_image', None),
+			is_special=getattr(bullet, 'is_special', False))
+		view.radius = bullet.radius
+		view.alive = getattr(bullet, 'alive', True)
+		return view
+
+	def clear(self):
+		self.flags[:] = 0
+		self.images = [None] * self.capacity
+		self.views = [None] * self.capacity
+		self.free = list(range(self.capacity - 1, -1, -1))
+		self.count = 0
+		self._order = None
+
+	def order(self):
+		"""Slots utilisés, dans l'ordre des tirs"""
+		if self._order is None:
+			used = np.flatnonzero(self.flags & USED)
+			self._order = used[np.argsort(self.serial[used], kind='stable')]
+		return self._order
+
+	def __len__(self):
+		return self.count
+
+	def __iter__(self):
+		views = self.views
+		return iter([views[s] for s in self.order().tolist()])
+
+	def __bool__(self):
+		return self.count > 0
+
+	def integrate(self, dt):
+		"""Avancer toutes les balles d'un pas (x += dx * speed * dt)"""
+		self.x += self.dx * self.speed * dt
+		self.y += self.dy * self.speed * dt
+
+	def save_positions(self):
+		"""Équivalent de fixed_step.save_positions pour toutes les balles"""
+		self.prev_x[:] = self.x
+		self.prev_y[:] = self.y
+
+	def cull(self, width, height):
+		"""Retirer les balles mortes ou sorties de [0, width] x [0, height]
+
+		Renvoie les vues des balles encore vivantes qui viennent de sortir de l'écran.
+		"""
+		used = (self.flags & USED) != 0
+		outside = used & ((self.x < 0) | (self.x > width) | (self.y < 0) | (self.y > height))
+		gone = outside & ((self.flags & ALIVE) != 0)
+		left = [self.views[s] for s in self._in_order(np.flatnonzero(gone))]
+		self.flags[outside] &= ~np.uint8(ALIVE)
+		self.release_dead()
+		return left
+
+	def release_dead(self):
+		"""Libérer les slots des balles qui ne sont plus vivantes"""
+		dead = np.flatnonzero(((self.flags & USED) != 0) & ((self.flags & ALIVE) == 0))
+		if not len(dead):
+			return
+		self.flags[dead] = 0
+		for s in dead.tolist():
+			self.images[s] = None
+			self.views[s] = None
+			self.free.append(s)
+		self.count -= len(dead)
+		self._order = None
+
+	def _in_order(self, slots):
+		return slots[np.argsort(self.serial[slots], kind='stable')].tolist()
+
+	def _selection(self, owner):
+		"""Slots des balles vivantes (du propriétaire donné), dans l'ordre des tirs"""
+		slots = self.order()
+		keep = (self.flags[slots] & ALIVE) != 0
+		if owner is not None:
+			keep &= self.owner[slots] == OWNERS.index(owner)
+		return slots[keep]
+
+	def near(self, x, y, radius, owner=None):
+		"""Balles vivantes (du propriétaire donné) dont le cercle touche le cercle (x, y, radius)"""
+		sel = self._selection(owner)
+		if not len(sel):
+			return []
+		ddx = self.x[sel] - x
+		ddy = self.y[sel] - y
+		r = self.radius[sel] + radius
+		hit = sel[ddx * ddx + ddy * ddy <= r * r]
+		return [self.views[s] for s in hit.tolist()]
+
+	def overlap_circles(self, cx, cy, cr, owner=None):
+		"""Contacts entre les balles vivantes et des cercles (tableaux cx, cy, cr)
+
+		Renvoie deux tableaux (slots des balles, indices des cercles), triés par ordre
+		de tir puis par indice de cercle. Les balles sont triées sur x: chaque cercle
+		ne teste que celles de sa bande verticale.
+		"""
+		empty = (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp))
+		sel = self._selection(owner)
+		if not len(sel) or not len(cx):
+			return empty
+		cx = np.asarray(cx, dtype=float)
+		cy = np.asarray(cy, dtype=float)
+		cr = np.asarray(cr, dtype=float)
+		bx = self.x[sel]
+		by = self.y[sel]
+		br = self.radius[sel]
+		by_x = np.argsort(bx, kind='stable')
+		sorted_x = bx[by_x]
+		reach = cr + br.max()
+		lo = np.searchsorted(sorted_x, cx - reach, 'left')
+		hi = np.searchsorted(sorted_x, cx + reach, 'right')
+		counts = hi - lo
+		ends = np.cumsum(counts)
+		if not ends[-1]:
+			return empty
+
+		hits_b = []
+		hits_c = []
+		start = 0
+		n = len(cx)
+		while start < n:
+			# paquet de cercles dont les candidats tiennent dans CHUNK
+			base = ends[start - 1] if start else 0
+			stop = max(start + 1, int(np.searchsorted(ends, base + CHUNK, 'right')))
+			c_counts = counts[start:stop]
+			total = int(c_counts.sum())
+			if total:
+				ci = np.repeat(np.arange(start, stop), c_counts)
+				offsets = np.arange(total) - np.repeat(np.cumsum(c_counts) - c_counts, c_counts)
+				bi = by_x[np.repeat(lo[start:stop], c_counts) + offsets]
+				ddx = bx[bi] - cx[ci]
+				ddy = by[bi] - cy[ci]
+				r = cr[ci] + br[bi]
+				hit = ddx * ddx + ddy * ddy <= r * r
+				hits_b.append(bi[hit])
+				hits_c.append(ci[hit])
+			start = stop
+
+		bi = np.concatenate(hits_b) if hits_b else empty[0]
+		ci = np.concatenate(hits_c) if hits_c else empty[1]
+		ranked = np.lexsort((ci, bi))
+		return sel[bi[ranked]], ci[ranked]
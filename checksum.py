@@ -0,0 +1,140 @@
+"""Empreintes de l'état de la simulation après chaque pas, pour vérifier qu'une optimisation
+ne change pas le jeu
+
+	python headless.py --level 3 --seconds 60 --seed 1 --checksums avant.sums
+	(modifier le moteur)
+	python headless.py --level 3 --seconds 60 --seed 1 --checksums apres.sums
+	python checksum.py avant.sums apres.sums
+
+Aussi: python replay.py partie.mmar --checksums rejeu.sums, ou MMA_CHECKSUMS=jeu.sums
+python main.py. Chaque pas écrit le numéro du pas et quatre CRC32: cibles (position,
+pv, vivante), balles (position, propriétaire, état, dans l'ordre des tirs), joueur
+(rectangle, demi-vies, munitions, rechargement) et niveau (combo_count du niveau 3,
+horloge de simulation). Les flottants sont hachés tels quels: deux parties ne sont
+identiques que si leurs états le sont au bit près.
+"""
+import struct
+import sys
+import zlib
+import numpy as np
+import sim_time
+from bullet_pool import BulletPool
+from swarm import TargetSwarm
+
+MAGIC = b"MMAS"
+VERSION = 1
+HEADER = struct.Struct("<4sH")
+# pas, puis un CRC32 par partie de l'état (PARTS)
+RECORD = struct.Struct("<IIIII")
+PARTS = ("cibles", "balles", "joueur", "niveau")
+DTYPE = np.dtype([("tick", "<u4")] + [(name, "<u4") for name in PARTS])
+
+
+def _targets_crc(targets):
+	n = len(targets)
+	hp = np.array([t.hp for t in targets], dtype=float)
+	if isinstance(targets, TargetSwarm):
+		crc = zlib.crc32(targets.x[:n].tobytes())
+		crc = zlib.crc32(targets.y[:n].tobytes(), crc)
+		crc = zlib.crc32(targets.alive[:n].tobytes(), crc)
+	else:
+		state = np.array([(t.x, t.y, t.alive) for t in targets], dtype=float)
+		crc = zlib.crc32(state.tobytes())
+	return zlib.crc32(hp.tobytes(), crc)
+
+
+def _bullets_crc(bullets):
+	if isinstance(bullets, BulletPool):
+		order = bullets.order()
+		crc = zlib.crc32(bullets.x[order].tobytes())
+		crc = zlib.crc32(bullets.y[order].tobytes(), crc)
+		crc = zlib.crc32(bullets.owner[order].tobytes(), crc)
+		return zlib.crc32(bullets.flags[order].tobytes(), crc)
+	state = np.array([(b.x, b.y, b.owner == 'player', b.alive) for b in bullets], dtype=float)
+	return zlib.crc32(state.tobytes())
+
+
+def state_crcs(game, level):
+	"""CRC32 des parties de l'état (dans l'ordre de PARTS)"""
+	r = game.player_rect
+	player = struct.pack("<4i2q?d", r.x, r.y, r.width, r.height, game.half_lives, game.ammo,
+		game.reloading, game.reload_remaining)
+	extra = struct.pack("<iq", getattr(level, 'combo_count', 0), sim_time.get_ticks())
+	return (
+		_targets_crc(getattr(level, 'targets', ())),
+		_bullets_crc(getattr(level, 'bullets', ())),
+		zlib.crc32(player),
+		zlib.crc32(extra),
+	)
+
+
+class ChecksumWriter:
+	"""Écrit l'empreinte de chaque pas dans un fichier, au fil de la partie"""
+
+	def __init__(self, path):
+		self.path = path
+		self.file = open(path, "wb")
+		self.file.write(HEADER.pack(MAGIC, VERSION))
+		self.tick = 0
+
+	def write(self, game, level):
+		self.file.write(RECORD.pack(self.tick, *state_crcs(game, level)))
+		self.tick += 1
+
+	def close(self):
+		if not self.file.closed:
+			self.file.close()
+
+
+def load(path):
+	"""Empreintes d'un fichier, en tableau NumPy structuré (champs tick et PARTS)"""
+	with open(path, "rb") as f:
+		data = f.read()
+	magic, version = HEADER.unpack_from(data)
+	if magic != MAGIC or version != VERSION:
+		raise ValueError(f"{path}: pas un fichier d'empreintes (version {VERSION})")
+	# un dernier pas incomplet (partie interrompue pendant l'écriture) est ignoré
+	count = (len(data) - HEADER.size) // DTYPE.itemsize
+	return np.frombuffer(data, dtype=DTYPE, count=count, offset=HEADER.size)
+
+
+def first_divergence(a, b):
+	"""(indice du premier pas différent, parties différentes) ou None si a et b concordent
+
+	Si l'une des suites est un préfixe de l'autre, les parties renvoyées sont vides.
+	"""
+	n = min(len(a), len(b))
+	differ = a[:n] != b[:n]
+	if differ.any():
+		i = int(np.argmax(differ))
+		return i, [name for name in ("tick",) + PARTS if a[i][name] != b[i][name]]
+	if len(a) != len(b):
+		return n, []
+	return None
+
+
+def main(argv=None):
+	import argparse
+
+	parser = argparse.ArgumentParser(description="Comparer deux fichiers d'empreintes et trouver le premier pas différent")
+	parser.add_argument("a")
+	parser.add_argument("b")
+	args = parser.parse_args(argv)
+
+	a = load(args.a)
+	b = load(args.b)
+	found = first_divergence(a, b)
+	if found is None:
+		print(f"identiques sur {len(a)} pas")
+		return 0
+	i, parts = found
+	if parts:
+		print(f"divergence au pas {int(a[i]['tick'])}: {', '.join(parts)} ({i} pas identiques avant)")
+	else:
+		print(f"identiques sur {i} pas, puis {args.a if len(a) > len(b) else args.b} continue seul "
+			f"({len(a)} / {len(b)} pas)")
+	return 1
+
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
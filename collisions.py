@@ -0,0 +1,79 @@
+"""Détection de collisions partagée par les niveaux
+
+Les balles de tous les niveaux sont dans un BulletPool (bullet_pool) et les cibles
+dans un TargetSwarm (swarm). La Broadphase est le balayage du pool: ses balles sont
+triées sur x et chaque cible ne teste que celles de sa bande verticale
+(BulletPool.overlap_circles); les tests fins, en NumPy sur toutes les balles à la
+fois, comparent des distances au carré. Les résultats sont toujours dans l'ordre
+de tir puis des cibles, pour que les niveaux appliquent les coups dans le même
+ordre qu'une double boucle balle / cible.
+"""
+import numpy as np
+from bullet_pool import BulletPool
+from swarm import TargetSwarm
+
+
+class Broadphase:
+	def __init__(self):
+		# fournis par rebuild() à chaque pas
+		self.targets = []
+		self.bullets = None
+
+	def rebuild(self, targets, bullets):
+		"""À appeler après les déplacements du pas, avant les tests de collision
+
+		Rien à précalculer: le pool trie ses balles sur x à chaque requête.
+		"""
+		self.targets = targets
+		self.bullets = bullets
+
+	def bullet_target_pairs(self, owner='player'):
+		"""Paires (balle, cible) en contact, triées par balle puis par cible"""
+		targets = self.targets
+		n = len(targets)
+		if isinstance(targets, TargetSwarm):
+			cx = targets.x[:n]
+			cy = targets.y[:n]
+			cr = targets.radius[:n]
+		else:
+			cx = np.fromiter((t.x for t in targets), float, n)
+			cy = np.fromiter((t.y for t in targets), float, n)
+			cr = np.fromiter((t.radius for t in targets), float, n)
+		slots, indices = self.bullets.overlap_circles(cx, cy, cr, owner)
+		views = self.bullets.views
+		return [(views[s], targets[i]) for s, i in zip(slots.tolist(), indices.tolist())]
+
+	def bullets_near(self, x, y, radius, owner=None):
+		"""Balles (du propriétaire donné) dont le cercle touche le cercle (x, y, radius)"""
+		return self.bullets.near(x, y, radius, owner)
+
+	def targets_near(self, x, y, radius):
+		"""Cibles dont le cercle touche le cercle (x, y, radius)"""
+		if isinstance(self.targets, TargetSwarm):
+			return self.targets.near(x, y, radius)
+		return _near(self.targets, x, y, radius, None)
+
+
+def _near(objs, x, y, radius, owner):
+	found = []
+	for o in objs:
+		if owner is not None and getattr(o, 'owner', None) != owner:
+			continue
+		dx = o.x - x
+		dy = o.y - y
+		r = o.radius + radius
+		if dx * dx + dy * dy <= r * r:
+			found.append(o)
+	return found
+
+
+def near(objs, x, y, radius, owner=None):
+	"""Comme Broadphase.bullets_near, pour un test ponctuel hors d'un pas de niveau"""
+	if isinstance(objs, BulletPool):
+		return objs.near(x, y, radius, owner)
+	return _near(objs, x, y, radius, owner)
+
+
+def player_radius(player):
+	"""Rayon de collision du joueur"""
+	return max(player.player_rect.width, player.player_rect.height) / 4
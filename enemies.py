@@ -0,0 +1,91 @@
+"""Types d'ennemis définis une seule fois
+
+Chaque Archetype regroupe les caractéristiques d'un ennemi (pv, rayon, comportement)
+et son sprite, mis à l'échelle une seule fois et partagé par toutes les instances.
+Faire apparaître un ennemi revient à créer une Target à partir de ces valeurs,
+sans accès disque.
+"""
+import random
+import asset_registry
+
+
+class Archetype:
+	def __init__(self, name, image, hp, radius, seeks_player=False, touch_damage=0.0, can_shoot=False,
+			invincible_duration=0, speed_range=None, speed_scale=None, steer_range=None):
+		self.name = name
+		self.image = image
+		self.hp = hp
+		self.radius = radius
+		self.seeks_player = seeks_player
+		self.touch_damage = touch_damage
+		self.can_shoot = can_shoot
+		# protection au spawn (ms)
+		self.invincible_duration = invincible_duration
+		# vitesse initiale multipliée par un tirage dans speed_range (vx puis vy)...
+		self.speed_range = speed_range
+		# ... ou par des facteurs fixes (fx, fy)
+		self.speed_scale = speed_scale
+		# force de recherche du joueur tirée dans cet intervalle (sinon celle de Target)
+		self.steer_range = steer_range
+
+	def sprite(self, radius=None):
+		"""Sprite partagé à la taille du rayon donné (rayon du type par défaut)
+
+		Le registre d'assets le met à l'échelle une seule fois par taille.
+		"""
+		d = (radius or self.radius) * 2
+		return asset_registry.image(self.image, (d, d), smooth=True)
+
+	def spawn(self, x, y, radius=None):
+		"""Nouvelle Target de ce type en (x, y); radius remplace le rayon du type"""
+		from level1 import Target
+
+		radius = radius or self.radius
+		t = Target(x, y, hp=self.hp, radius=radius, seeks_player=self.seeks_player,
+			touch_damage=self.touch_damage, can_shoot=self.can_shoot, image=self.sprite(radius))
+		t.archetype = self
+		t.invincible_duration = self.invincible_duration
+		if self.speed_range:
+			t.vx *= random.uniform(*self.speed_range)
+			t.vy *= random.uniform(*self.speed_range)
+		if self.speed_scale:
+			t.vx *= self.speed_scale[0]
+			t.vy *= self.speed_scale[1]
+		if self.steer_range:
+			t.steer_strength = random.uniform(*self.steer_range)
+		return t
+
+
+ARCHETYPES = {}
+
+
+def define(name, image, hp, radius, **kwargs):
+	archetype = Archetype(name, image, hp, radius, **kwargs)
+	ARCHETYPES[name] = archetype
+	return archetype
+
+
+# soldats: cherchent le joueur, dégâts au contact
+SOLDAT1 = define("soldat1", "soldat1.png", hp=1, radius=28, seeks_player=True, touch_damage=0.5, speed_range=(0.35, 0.55))
+SOLDAT2 = define("soldat2", "soldat2.png", hp=2, radius=40, seeks_player=True, touch_damage=0.5, speed_range=(0.35, 0.55))
+# tank: plus grand, tire sur le joueur et descend moins vite
+SOLDAT3 = define("soldat3", "soldat3.png", hp=4, radius=70, can_shoot=True, speed_scale=(1, 0.5))
+# boxeurs: cherchent le joueur, dégâts au contact, protégés 2.5 s au spawn
+BOXEUR1 = define("boxeur1", "boxeur1.png", hp=10, radius=40, seeks_player=True, touch_damage=0.5,
+	invincible_duration=2500, speed_range=(0.35, 0.55))
+BOXEUR2 = define("boxeur2", "boxeur 2.png", hp=10, radius=40, seeks_player=True, touch_damage=0.5,
+	invincible_duration=2500, speed_range=(0.35, 0.55))
+BOXEUR3 = define("boxeur3", "boxeur3.png", hp=10, radius=40, seeks_player=True, touch_damage=0.5,
+	invincible_duration=2500, speed_range=(0.35, 0.55))
+BOXERS = (BOXEUR1, BOXEUR2, BOXEUR3)
+# boss: tire sur le joueur, plus rapide à l'horizontale
+BOSS = define("boss", "boss.png", hp=25, radius=75, can_shoot=True, invincible_duration=2500, speed_scale=(1.5, 0.75))
+# boss de l'easter egg: cherche le joueur et tire, mais ne blesse pas au contact
+BOSS_EASTER_EGG = define("boss_easter_egg", "boss_easter_egg.png", hp=50, radius=60, seeks_player=True,
+	can_shoot=True, speed_range=(0.6, 0.9), steer_range=(50, 70))
+
+
+def preload():
+	"""Mettre à l'échelle tous les sprites d'ennemis (au rayon de leur type)"""
+	for archetype in ARCHETYPES.values():
+		archetype.sprite()
@@ -0,0 +1,79 @@
+class FixedStep:
+	"""Boucle à pas fixe: le temps réel mesuré alimente un accumulateur consommé par pas de dt"""
+
+	def __init__(self, dt=0.016, max_steps=5):
+		self.dt = dt
+		# au-delà, on ralentit le jeu plutôt que d'enchaîner les pas sans fin
+		self.max_steps = max_steps
+		self.accumulator = 0.0
+		self.alpha = 0.0
+		self.total_steps = 0
+
+	def advance(self, frame_time):
+		"""Ajouter le temps écoulé depuis la frame précédente; renvoie le nombre de pas à simuler"""
+		self.accumulator += min(frame_time, self.dt * self.max_steps)
+		steps = 0
+		while self.accumulator >= self.dt and steps < self.max_steps:
+			self.accumulator -= self.dt
+			steps += 1
+		self.total_steps += steps
+		# fraction du pas suivant déjà écoulée, pour interpoler le rendu
+		self.alpha = min(1.0, self.accumulator / self.dt)
+		return steps
+
+	def reset(self):
+		"""Oublier le temps accumulé (après une pause, une transition, un chargement...)"""
+		self.accumulator = 0.0
+		self.alpha = 0.0
+
+
+def save_positions(objs):
+	"""Mémoriser la position de chaque objet avant un pas de simulation"""
+	if hasattr(objs, 'save_positions'):
+		# BulletPool: copie des tableaux en une fois
+		objs.save_positions()
+		return
+	for o in objs:
+		o.prev_x = o.x
+		o.prev_y = o.y
+
+
+class Interpolated:
+	"""Déplacer temporairement les objets entre leur position précédente et actuelle pendant le rendu
+
+	with Interpolated(objs, player, alpha):
+		dessiner...
+	"""
+
+	def __init__(self, objs, player, alpha):
+		self.objs = objs
+		self.player = player
+		self.alpha = alpha
+		self.saved = []
+		self.saved_player_x = None
+
+	def __enter__(self):
+		a = self.alpha
+		for o in self.objs:
+			px = getattr(o, 'prev_x', None)
+			if px is None:
+				continue
+			self.saved.append((o, o.x, o.y))
+			o.x = px + (o.x - px) * a
+			o.y = o.prev_y + (o.y - o.prev_y) * a
+		if self.player is not None:
+			prev = getattr(self.player, 'prev_rect_x', None)
+			if prev is not None:
+				self.saved_player_x = self.player.player_rect.x
+				self.player.player_rect.x = round(prev + (self.player.player_rect.x - prev) * a)
+		return self
+
+	def __exit__(self, *exc):
+		for o, x, y in self.saved:
+			o.x = x
+			o.y = y
+		self.saved = []
+		if self.saved_player_x is not None:
+			self.player.player_rect.x = self.saved_player_x
+			self.saved_player_x = None
+		return False
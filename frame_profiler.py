@@ -0,0 +1,223 @@
+"""Temps passé dans chaque phase de la boucle de jeu, frame par frame
+
+La boucle de main.py appelle start_frame(), puis lap(phase) à la fin de chaque phase
+(événements, game.update, level.update...), puis end_frame(level). Le temps écoulé
+depuis le lap précédent est ajouté à la phase: les pas de simulation répétés dans
+une même frame s'additionnent. Les frames sont gardées dans un tampon circulaire
+de taille fixe, avec le nombre de cibles, balles et explosions du niveau et le
+retard de son ordonnanceur d'IA (ai_scheduler).
+
+F3 affiche le panneau (moyenne et maximum par phase, historique du temps de frame
+par rapport au budget de 16 ms); F4 écrit le tampon dans un fichier CSV.
+"""
+import csv
+import time
+import numpy as np
+import pygame
+from bullet_pool import ALIVE, BulletPool
+from swarm import TargetSwarm
+
+# phases, dans l'ordre de la boucle; "autre" reçoit ce qui n'est attribué à aucune
+PHASES = (
+	"events",
+	"autre",
+	"game.update",
+	"level.update",
+	"balles ennemies",
+	"levels.draw",
+	"joueur",
+	"draw_hud",
+	"overlay",
+	"flip",
+	"attente",
+)
+INDEX = {name: i for i, name in enumerate(PHASES)}
+# l'attente de clock.tick ne compte pas dans le coût de la frame
+WORK = [i for i, name in enumerate(PHASES) if name != "attente"]
+
+# compteurs relevés à la fin de chaque frame (vivants / présents dans le niveau)
+COUNTS = (
+	"cibles",
+	"cibles total",
+	"balles",
+	"balles total",
+	"explosions",
+	"retard ia (ms)",
+)
+
+BUDGET_MS = 1000.0 / 60
+
+
+def entity_counts(level):
+	"""(cibles vivantes, cibles, balles vivantes, balles, explosions, retard de l'IA) du niveau"""
+	targets = getattr(level, 'targets', ())
+	bullets = getattr(level, 'bullets', ())
+	n = len(targets)
+	if isinstance(targets, TargetSwarm):
+		live_targets = int(np.count_nonzero(targets.alive[:n]))
+	else:
+		live_targets = sum(1 for t in targets if t.alive)
+	if isinstance(bullets, BulletPool):
+		live_bullets = int(np.count_nonzero(bullets.flags & ALIVE))
+	else:
+		live_bullets = sum(1 for b in bullets if b.alive)
+	ai = getattr(level, 'ai', None)
+	lag = int(ai.lag_ms) if ai is not None else 0
+	return (live_targets, n, live_bullets, len(bullets), len(getattr(level, 'explosions', ())), lag)
+
+
+class FrameProfiler:
+	def __init__(self, capacity=600):
+		self.capacity = capacity
+		# ms par phase et compteurs, une ligne par frame
+		self.times = np.zeros((capacity, len(PHASES)))
+		self.counts = np.zeros((capacity, len(COUNTS)), dtype=np.int32)
+		self.frame_numbers = np.zeros(capacity, dtype=np.int64)
+		# prochaine ligne écrite et nombre de lignes valides
+		self.next = 0
+		self.size = 0
+		self.frame = 0
+		self.current = [0.0] * len(PHASES)
+		# instant du dernier lap (None: pas de frame en cours, lap() ne fait rien)
+		self.last = None
+		self.skip = False
+
+	def start_frame(self):
+		self.current = [0.0] * len(PHASES)
+		self.skip = False
+		self.last = time.perf_counter()
+
+	def lap(self, phase):
+		"""Attribuer à phase le temps écoulé depuis le lap précédent"""
+		if self.last is None:
+			return
+		now = time.perf_counter()
+		self.current[INDEX[phase]] += now - self.last
+		self.last = now
+
+	def skip_frame(self):
+		"""Ne pas enregistrer la frame en cours (transition, chargement, écran de fin...)"""
+		self.skip = True
+
+	def end_frame(self, level=None):
+		if self.last is None:
+			return
+		self.last = None
+		self.frame += 1
+		if self.skip:
+			return
+		i = self.next
+		self.times[i] = self.current
+		self.times[i] *= 1000.0
+		if level is not None:
+			self.counts[i] = entity_counts(level)
+		self.frame_numbers[i] = self.frame
+		self.next = (i + 1) % self.capacity
+		self.size = min(self.size + 1, self.capacity)
+
+	def _ordered(self, array, last=None):
+		"""Lignes valides de array, de la plus ancienne à la plus récente (les last dernières)"""
+		n = self.size if last is None else min(last, self.size)
+		idx = (self.next - n + np.arange(n)) % self.capacity
+		return array[idx]
+
+	def recent(self, last=None):
+		return self._ordered(self.times, last)
+
+	def latest_counts(self):
+		if not self.size:
+			return (0,) * len(COUNTS)
+		return tuple(self.counts[(self.next - 1) % self.capacity].tolist())
+
+	def clear(self):
+		self.next = 0
+		self.size = 0
+
+	def export_csv(self, path=None):
+		"""Écrire le tampon (frame, ms par phase, total, compteurs) dans un CSV; renvoie le chemin"""
+		if path is None:
+			path = time.strftime("frames_%Y%m%d_%H%M%S.csv")
+		times = self.recent()
+		counts = self._ordered(self.counts)
+		frames = self._ordered(self.frame_numbers)
+		with open(path, "w", newline="") as f:
+			writer = csv.writer(f)
+			writer.writerow(("frame",) + PHASES + ("total",) + COUNTS)
+			for frame, row, count in zip(frames.tolist(), times, counts.tolist()):
+				writer.writerow([frame] + [f"{v:.3f}" for v in row] + [f"{row[WORK].sum():.3f}"] + count)
+		return path
+
+
+class ProfilerOverlay:
+	"""Panneau des temps par phase, recomposé quelques fois par seconde seulement"""
+	# bord droit des colonnes moyenne et maximum (px)
+	COLUMNS = (190, 250)
+
+	def __init__(self, profiler, window=120, refresh_ms=250):
+		self.profiler = profiler
+		# nombre de frames résumées et affichées dans l'historique
+		self.window = window
+		self.refresh_ms = refresh_ms
+		self.surface = None
+		self.built_at = None
+		self.font = None
+
+	def draw(self, screen):
+		now = pygame.time.get_ticks()
+		if self.surface is None or now - self.built_at >= self.refresh_ms:
+			self.rebuild()
+			self.built_at = now
+		return screen.blit(self.surface, (screen.get_width() - self.surface.get_width() - 10, 10))
+
+	def rebuild(self):
+		if self.font is None:
+			self.font = pygame.font.Font(None, 18)
+		times = self.profiler.recent(self.window)
+		# lignes de cellules: libellé puis valeurs alignées à droite sur COLUMNS
+		rows = [("phase (ms)", "moy", "max")]
+		if len(times):
+			mean = times.mean(axis=0)
+			peak = times.max(axis=0)
+			for i, name in enumerate(PHASES):
+				rows.append((name, f"{mean[i]:.2f}", f"{peak[i]:.2f}"))
+			totals = times[:, WORK].sum(axis=1)
+			rows.append(("total", f"{totals.mean():.2f}", f"{totals.max():.2f}"))
+			over = int((totals > BUDGET_MS).sum())
+			rows.append((f"{over}/{len(totals)} frames > {BUDGET_MS:.1f} ms",))
+		else:
+			totals = np.zeros(0)
+		counts = dict(zip(COUNTS, self.profiler.latest_counts()))
+		rows.append((f"cibles {counts['cibles']}/{counts['cibles total']}  "
+			f"balles {counts['balles']}/{counts['balles total']}  explosions {counts['explosions']}",))
+		rows.append((f"retard ia {counts['retard ia (ms)']} ms",))
+
+		line_h = self.font.get_linesize()
+		graph_h = 40
+		width = 260
+		height = 8 + line_h * len(rows) + graph_h + 8
+		surf = pygame.Surface((width, height), pygame.SRCALPHA)
+		surf.fill((0, 0, 0, 170))
+		y = 6
+		for row in rows:
+			surf.blit(self.font.render(row[0], True, (0, 255, 255)), (6, y))
+			for text, right in zip(row[1:], self.COLUMNS):
+				cell = self.font.render(text, True, (0, 255, 255))
+				surf.blit(cell, (right - cell.get_width(), y))
+			y += line_h
+
+		# historique du coût des frames: une barre par frame, ligne rouge au budget
+		top = y + 2
+		scale = graph_h / (2 * BUDGET_MS)
+		bar_w = max(1, (width - 12) // self.window)
+		for i, total in enumerate(totals.tolist()):
+			h = min(graph_h, int(total * scale))
+			color = (255, 80, 80) if total > BUDGET_MS else (80, 255, 80)
+			pygame.draw.rect(surf, color, (6 + i * bar_w, top + graph_h - h, bar_w, h))
+		budget_y = top + graph_h - int(BUDGET_MS * scale)
+		pygame.draw.line(surf, (255, 0, 0), (6, budget_y), (width - 6, budget_y))
+		self.surface = surf
+
+
+# profileur partagé par la boucle de jeu et le renderer
+profiler = FrameProfiler()
+overlay = ProfilerOverlay(profiler)
@@ -0,0 +1,199 @@
+"""Simulation accélérée sans affichage ni son, pour l'équilibrage et les tests de performance
+
+	python headless.py --level 3 --seconds 3600 --seed 1
+
+Le temps simulé vient de sim_time (avancé pas à pas, sans limite de fréquence) et
+la souris / le clavier de sources scriptées (voir input_source).
+"""
+import os
+
+# doit être défini avant l'initialisation de pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import random
+import time
+import pygame
+import input_source
+import sim_time
+import checksum
+import simulation
+import sound_bank
+from bsd import BSD
+from level1 import Level1
+from level2 import Level2
+from level3 import Level3
+from level_easter_egg import LevelEasterEgg
+from level_horde import LevelHorde
+
+LEVELS = {
+	"1": Level1,
+	"2": Level2,
+	"3": Level3,
+	"egg": LevelEasterEgg,
+	"horde": LevelHorde,
+}
+
+
+def init_display(size=(960, 600)):
+	if not pygame.get_init():
+		pygame.init()
+	screen = pygame.display.get_surface()
+	if screen is None or screen.get_size() != tuple(size):
+		screen = pygame.display.set_mode(size)
+	# décoder les sons maintenant plutôt qu'au premier tir simulé
+	sound_bank.bank.load()
+	return screen
+
+
+def aim_at_first_target(get_level):
+	"""Source de souris scriptée: vise la première cible vivante du niveau courant"""
+	def source():
+		level = get_level()
+		for t in level.targets:
+			if t.alive:
+				return (int(t.x), int(t.y))
+		w, h = level.screen.get_size()
+		return (w // 2, h // 3)
+	return source
+
+
+def strafe_keys(period):
+	"""Source de clavier scriptée: alterne gauche / droite toutes les period secondes"""
+	left = input_source.PressedKeys([pygame.K_LEFT])
+	right = input_source.PressedKeys([pygame.K_RIGHT])
+
+	def source():
+		phase = int((sim_time.get_ticks() - sim_time.START_MS) / 1000.0 / period)
+		return left if phase % 2 == 0 else right
+	return source
+
+
+def reset_player(game):
+	game.half_lives = 6
+	game.ammo = game.max_ammo
+	game.reloading = False
+	game.center_player()
+
+
+def fire(game, level):
+	"""Clic gauche simulé: respecte les munitions et le rechargement du joueur"""
+	event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=input_source.get_mouse_pos())
+	if game.handle_event(event) == "shoot" and hasattr(level, 'shoot'):
+		level.shoot(game.player_rect)
+		return True
+	return False
+
+
+def run(level_cls, seconds, dt=0.016, seed=0, mouse=None, keys=None, fire_interval=0.15, size=(960, 600), restart=True,
+		checksums=None, bot=None):
+	"""Simuler seconds secondes de jeu sur level_cls et renvoyer des statistiques
+
+	checksums: fichier où écrire l'empreinte de l'état après chaque pas (voir checksum).
+	bot: classe construite avec (joueur, fonction renvoyant le niveau courant) dont les
+	méthodes mouse() et keys() remplacent les sources de souris et de clavier.
+	"""
+	random.seed(seed)
+	sim_time.reset()
+	screen = init_display(size)
+	game = BSD(screen)
+	reset_player(game)
+	current = [level_cls(screen)]
+
+	if bot is not None:
+		player = bot(game, lambda: current[0])
+		mouse = player.mouse
+		keys = player.keys
+	input_source.set_mouse_source(mouse or aim_at_first_target(lambda: current[0]))
+	input_source.set_keys_source(keys or (lambda: input_source.PressedKeys()))
+
+	stats = {
+		"level": level_cls.__name__,
+		"seed": seed,
+		"dt": dt,
+		"ticks": 0,
+		"sim_seconds": 0.0,
+		"wall_seconds": 0.0,
+		"clears": 0,
+		"deaths": 0,
+		"shots": 0,
+		# coups reçus: pas où le joueur a perdu des demi-vies
+		"hits": 0,
+		"clear_times": [],
+	}
+	total_ticks = int(seconds / dt)
+	next_shot = 0.0
+	level_start = 0
+	sums = checksum.ChecksumWriter(checksums) if checksums else None
+	start = time.perf_counter()
+	try:
+		for tick in range(total_ticks):
+			level = current[0]
+			if fire_interval and tick * dt >= next_shot:
+				next_shot += fire_interval
+				if fire(game, level):
+					stats["shots"] += 1
+				if getattr(level, 'special_bullet_ready', False):
+					level.shoot_special(game.player_rect)
+
+			half_lives = game.half_lives
+			outcome = simulation.step(game, level, dt)
+			stats["ticks"] += 1
+			if game.half_lives < half_lives:
+				stats["hits"] += 1
+			if sums is not None:
+				sums.write(game, level)
+			if outcome is None:
+				continue
+			if outcome == simulation.DEAD:
+				stats["deaths"] += 1
+			else:
+				stats["clears"] += 1
+				stats["clear_times"].append((tick + 1 - level_start) * dt)
+			if not restart:
+				break
+			reset_player(game)
+			current[0] = level_cls(screen)
+			level_start = tick + 1
+	finally:
+		input_source.set_mouse_source(None)
+		input_source.set_keys_source(None)
+		if sums is not None:
+			sums.close()
+
+	stats["wall_seconds"] = time.perf_counter() - start
+	stats["sim_seconds"] = stats["ticks"] * dt
+	stats["ticks_per_second"] = stats["ticks"] / stats["wall_seconds"] if stats["wall_seconds"] > 0 else 0.0
+	stats["speedup"] = stats["sim_seconds"] / stats["wall_seconds"] if stats["wall_seconds"] > 0 else 0.0
+	return stats
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--level", choices=sorted(LEVELS), default="1")
+	parser.add_argument("--seconds", type=float, default=600.0, help="durée de jeu simulée")
+	parser.add_argument("--dt", type=float, default=0.016, help="durée d'un pas de simulation")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--fire-interval", type=float, default=0.15, help="secondes entre deux tirs (0: ne pas tirer)")
+	parser.add_argument("--strafe", type=float, default=0.0, help="alterner gauche/droite toutes les N secondes")
+	parser.add_argument("--once", action="store_true", help="s'arrêter à la première victoire ou défaite")
+	parser.add_argument("--json", action="store_true", help="sortie JSON")
+	parser.add_argument("--checksums", help="écrire l'empreinte de l'état après chaque pas (voir checksum)")
+	args = parser.parse_args(argv)
+
+	keys = strafe_keys(args.strafe) if args.strafe > 0 else None
+	stats = run(LEVELS[args.level], args.seconds, dt=args.dt, seed=args.seed, keys=keys,
+		fire_interval=args.fire_interval, restart=not args.once, checksums=args.checksums)
+	if args.json:
+		print(json.dumps(stats))
+	else:
+		print(f"{stats['level']}: {stats['sim_seconds']:.0f} s simulées en {stats['wall_seconds']:.2f} s "
+			f"({stats['ticks_per_second']:.0f} pas/s, x{stats['speedup']:.0f})")
+		print(f"  victoires {stats['clears']}  défaites {stats['deaths']}  tirs {stats['shots']}  coups reçus {stats['hits']}")
+	pygame.quit()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,100 @@
+import pygame
+import atlas
+import text_cache
+
+RETICLE_COLOR = (255, 100, 100)
+
+
+class HudLayer:
+	"""HUD pré-composé: reconstruit seulement quand les vies, les munitions ou le rechargement changent"""
+
+	def __init__(self):
+		self.surface = None
+		self.state = None
+		self.rebuilds = 0
+
+	def draw(self, screen, game):
+		state = (game.half_lives, game.ammo, game.max_ammo, game.reloading, id(game))
+		if state != self.state:
+			self.rebuild(game)
+			self.state = state
+		return screen.blit(self.surface, (0, 0))
+
+	def rebuild(self, game):
+		self.rebuilds += 1
+		# Dessiner les images de vie (6 demi-vies = 3 vies pleines)
+		x_offset = 10
+		y_offset = 8
+
+		full_lives = game.half_lives // 2
+		half_life = game.half_lives % 2
+
+		reload_text = text_cache.render("RECHARGEMENT", 28, (200, 200, 0)) if game.reloading else None
+
+		# taille du calque: tout ce qui est dessiné à partir du coin supérieur gauche
+		# (les cœurs font 50px espacés de 35, les balles 28px espacées de 8)
+		width = x_offset + 35 * (max(0, full_lives) + half_life) + 30 + 8 * game.max_ammo + 20
+		height = y_offset + 50
+		if reload_text:
+			width += reload_text.get_width()
+			height = max(height, y_offset + reload_text.get_height())
+		self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+		# cœurs et balles viennent de la planche de sprites: un seul blits() pour tout le calque
+		batch = atlas.SpriteBatch(self.surface)
+
+		# dessiner les vies pleines
+		for i in range(full_lives):
+			if game.hp_img:
+				batch.blit(game.hp_img, (x_offset, y_offset))
+			x_offset += 35
+
+		# dessiner la demi-vie si présente
+		if half_life > 0:
+			if game.mihp_img:
+				batch.blit(game.mihp_img, (x_offset, y_offset))
+			x_offset += 35
+
+		# Munitions avec images de balles
+		x_offset += 30
+		for i in range(game.ammo):
+			batch.blit(game.balle_img, (x_offset, y_offset + 3))
+			x_offset += 8
+
+		# dessiner les balles restantes sous forme de contours (emplacements vides)
+		for i in range(game.max_ammo - game.ammo):
+			batch.blit(game.balle_empty_img, (x_offset, y_offset + 3))
+			x_offset += 8
+
+		# Statut de rechargement
+		if reload_text:
+			batch.blit(reload_text, (x_offset + 20, y_offset))
+		batch.flush()
+
+
+# radius -> sprite du réticule
+_reticles = {}
+
+
+def reticle_sprite(radius=15):
+	sprite = _reticles.get(radius)
+	if sprite is None:
+		c = radius + 5
+		sprite = pygame.Surface((2 * c + 1, 2 * c + 1), pygame.SRCALPHA)
+		pygame.draw.circle(sprite, RETICLE_COLOR, (c, c), radius, 2)
+		pygame.draw.line(sprite, RETICLE_COLOR, (0, c), (2 * c, c), 1)
+		pygame.draw.line(sprite, RETICLE_COLOR, (c, 0), (c, 2 * c), 1)
+		_reticles[radius] = sprite
+	return sprite
+
+
+def draw_reticle(screen, pos, radius=15):
+	c = radius + 5
+	return screen.blit(reticle_sprite(radius), (pos[0] - c, pos[1] - c))
+
+
+# calque partagé du HUD de jeu
+hud_layer = HudLayer()
+
+
+def draw_hud(screen, game):
+	return hud_layer.draw(screen, game)
@@ -0,0 +1,40 @@
+import pygame
+
+# Sources d'entrée injectables: par défaut la souris et le clavier réels,
+# remplaçables par des sources scriptées (simulation sans affichage, rejeu...)
+_mouse_source = None
+_keys_source = None
+
+
+def get_mouse_pos():
+	if _mouse_source is not None:
+		return _mouse_source()
+	return pygame.mouse.get_pos()
+
+
+def get_pressed():
+	if _keys_source is not None:
+		return _keys_source()
+	return pygame.key.get_pressed()
+
+
+def set_mouse_source(source):
+	"""source: fonction sans argument renvoyant (x, y), ou None pour la vraie souris"""
+	global _mouse_source
+	_mouse_source = source
+
+
+def set_keys_source(source):
+	"""source: fonction sans argument renvoyant un objet indexable par code de touche, ou None"""
+	global _keys_source
+	_keys_source = source
+
+
+class PressedKeys:
+	"""État clavier scripté, indexable comme pygame.key.get_pressed()"""
+
+	def __init__(self, keys=()):
+		self.keys = set(keys)
+
+	def __getitem__(self, key):
+		return key in self.keys
@@ -2,6 +2,17 @@ import pygame # type: ignore
 from pathlib import Path
 import random
 from level_base import Level
+import asset_registry
+import atlas
+import collisions
+import enemies
+import preloader
+from bullet_pool import BulletPool
+from swarm import TargetSwarm, column
+import input_source
+import sim_time
+import sound_bank
+import surface_cache
 
 ASSETS = Path(__file__).parent / "assets"
 
@@ -10,10 +21,27 @@ ASSETS = Path(__file__).parent / "assets"
 class Target:
 	# variable de classe pour l'image d'indicateur de coup
 	hit_img = None
-	# class variable for hitmarker sound
-	hitmarker_sound = None
+
+	# rangés dans les tableaux de la TargetSwarm du niveau (voir swarm.py)
+	x = column('x')
+	y = column('y')
+	vx = column('vx')
+	vy = column('vy')
+	prev_x = column('prev_x')
+	prev_y = column('prev_y')
+	radius = column('radius')
+	steer_strength = column('steer_strength')
+	aim_x = column('aim_x')
+	aim_y = column('aim_y')
+	alive = column('alive')
+	seeks_player = column('seeks_player')
+	can_shoot = column('can_shoot')
 	
-	def __init__(self, x, y, image_path=None, hp=1, radius=20, seeks_player=False, touch_damage=0.0, can_shoot=False):
+	def __init__(self, x, y, image_path=None, hp=1, radius=20, seeks_player=False, touch_damage=0.0, can_shoot=False, image=None):
+		self.swarm = None
+		self.slot = None
+		self._prev_x = None
+		self._prev_y = None
 		self.x = x
 		self.y = y
 		self.alive = True
@@ -32,8 +60,11 @@ class Target:
 		self.last_shot_time = 0
 		# randomiser la force de recherche par soldat
 		self.steer_strength = random.uniform(30, 50) if seeks_player else 0
+		# direction vers le joueur, mise à jour par l'ordonnanceur d'IA du niveau
+		self.aim_x = 0.0
+		self.aim_y = 0.0
 		# minuteur d'invincibilité (pour la protection au spawn)
-		self.spawn_time = pygame.time.get_ticks()
+		self.spawn_time = sim_time.get_ticks()
 		self.invincible_duration = 0  # ms, peut être défini après création
 		# indicateur de coup
 		self.show_hit = False
@@ -41,16 +72,15 @@ class Target:
 		self.hit_duration = 400  # ms
 		# charger l'image de coup si pas déjà chargée
 		if Target.hit_img is None:
-			Target.hit_img = pygame.image.load(str(ASSETS / "hit.png")).convert_alpha()
-			Target.hit_img = pygame.transform.scale(Target.hit_img, (100, 100))
-		# charger le son du hitmarker si pas déjà chargé
-		if Target.hitmarker_sound is None:
-			Target.hitmarker_sound = pygame.mixer.Sound(str(ASSETS / "hitmarker_2.mp3"))
-			Target.hitmarker_sound.set_volume(0.4)
-		if image_path:
-			img = pygame.image.load(str(image_path))
+			Target.hit_img = atlas.get("hit")
+		# type d'ennemi (enemies.Archetype) dont la cible est issue, s'il y en a un
+		self.archetype = None
+		if image is not None:
+			# sprite déjà à l'échelle, partagé entre les cibles du même type
+			self.image = image
+		elif image_path:
 			d = self.radius * 2
-			self.image = pygame.transform.smoothscale(img, (d, d))
+			self.image = asset_registry.image(image_path, (d, d), smooth=True)
 		else:
 			self.image = None
 
@@ -78,10 +108,9 @@ class Target:
 	def trigger_hit(self):
 		"""Afficher l'indicateur de coup quand l'ennemi prend des dégâts mais ne meurt pas"""
 		self.show_hit = True
-		self.hit_time = pygame.time.get_ticks()
+		self.hit_time = sim_time.get_ticks()
 		# jouer le son du hitmarker
-		if Target.hitmarker_sound:
-			Target.hitmarker_sound.play()
+		sound_bank.play("hitmarker")
 
 
 
@@ -107,14 +136,16 @@ class Bullet:
 			self.speed = speed
 		self.radius = 4
 		self.alive = True
+		Bullet.load_images()
+
+	@staticmethod
+	def load_images():
 		# charger l'image de balle si pas déjà chargée
 		if Bullet.bullet_img is None:
-			Bullet.bullet_img = pygame.image.load(str(ASSETS / "balle.png"))
-			Bullet.bullet_img = pygame.transform.scale(Bullet.bullet_img, (24, 24))
+			Bullet.bullet_img = atlas.get("balle")
 		# charger l'image de poing si pas déjà chargée
 		if Bullet.poing_img is None:
-			Bullet.poing_img = pygame.image.load(str(ASSETS / "poing.png"))
-			Bullet.poing_img = pygame.transform.scale(Bullet.poing_img, (32, 32))
+			Bullet.poing_img = atlas.get("poing")
 
 	def update(self, dt, *_args, **_kwargs):
 		# déplacer la balle dans sa direction fixe (définie au moment du tir)
@@ -125,12 +156,21 @@ class Bullet:
 class Level1(Level):
 	def __init__(self, screen):
 		super().__init__(screen)
-		self.background_img = pygame.image.load(str(ASSETS / "lvl1.png"))
-		self.targets = []
-		self.bullets = []
+		self.background_img = asset_registry.image("lvl1.png")
+		self.targets = TargetSwarm()
+		self.bullets = BulletPool()
+		Bullet.load_images()
 		self.completed = False
 		self.spawn_targets()
 
+	@classmethod
+	def preload_jobs(cls):
+		return [
+			preloader.image_job("lvl1.png"),
+			preloader.sprite_job(enemies.SOLDAT1),
+			preloader.sprite_job(enemies.SOLDAT2),
+		] + preloader.bullet_jobs()
+
 	def spawn_targets(self):
 		w, h = self.screen.get_size()
 		# Faire apparaître 3 soldats type1 (pv=1) et 2 soldats type2 (pv=2)
@@ -140,35 +180,25 @@ class Level1(Level):
 			x = positions[i]
 			# randomiser légèrement la position Y
 			y = h // 3 + random.randint(-30, 30)
-			img = ASSETS / "soldat1.png"
 			# soldat1: plus grand que par défaut, cherche le joueur, dégâts au contact
-			t = Target(x, y, image_path=img, hp=1, radius=28, seeks_player=True, touch_damage=0.5)
-			# randomize soldier movements more
-			t.vx *= random.uniform(0.35, 0.55)
-			t.vy *= random.uniform(0.35, 0.55)
-			self.targets.append(t)
+			self.targets.append(enemies.SOLDAT1.spawn(x, y))
 		# les 2 suivants -> soldat2
 		for i in range(3, 5):
 			x = positions[i]
 			# randomize Y position slightly
 			y = h // 3 + random.randint(-30, 30)
-			img = ASSETS / "soldat2.png"
 			# soldat2: plus de pv, cherche le joueur, dégâts au contact
-			t = Target(x, y, image_path=img, hp=2, radius=40, seeks_player=True, touch_damage=0.5)
-			# randomize soldier movements more
-			t.vx *= random.uniform(0.35, 0.55)
-			t.vy *= random.uniform(0.35, 0.55)
-			self.targets.append(t)
+			self.targets.append(enemies.SOLDAT2.spawn(x, y))
 
 	def shoot(self, player_rect):
-		mx, my = pygame.mouse.get_pos()
+		mx, my = input_source.get_mouse_pos()
 		dx = mx - player_rect.centerx
 		dy = my - player_rect.centery
 		dist = (dx**2 + dy**2)**0.5
 		if dist > 0:
 			dx /= dist
 			dy /= dist
-		self.bullets.append(Bullet(player_rect.centerx, player_rect.centery, dx, dy, owner='player'))
+		self.bullets.spawn(player_rect.centerx, player_rect.centery, dx, dy, owner='player')
 
 	def handle_event(self, event):
 		if event.type == pygame.VIDEORESIZE:
@@ -182,95 +212,76 @@ class Level1(Level):
 		player_x = player.player_rect.centerx if player else w // 2
 		player_y = player.player_rect.centery if player else h // 2
 		
-		for t in self.targets:
-			if t.alive:
-				t.update(dt, w, h, player_x, player_y)
-
-		for b in self.bullets:
-			b.update(dt)
-		
-		self.bullets = [b for b in self.bullets if b.alive and 0 <= b.x <= w and 0 <= b.y <= h]
+		served = self.ai.select(self.targets, dt)
+		self.targets.step(dt, w, h, player_x, player_y, served)
 
-		# les balles du joueur endommagent les cibles
-		for b in list(self.bullets):
-			if getattr(b, 'owner', 'player') == 'player':
-				for t in self.targets:
-					if t.alive:
-						dx = b.x - t.x
-						dy = b.y - t.y
-						dist = (dx**2 + dy**2)**0.5
-						if dist <= t.radius + b.radius:
-							b.alive = False
-							t.hp -= 1
-							if t.hp <= 0:
-								t.alive = False
-							else:
-								# afficher l'indicateur de coup si l'ennemi survit
-								t.trigger_hit()
+		self.bullets.integrate(dt)
+		self.bullets.cull(w, h)
 
-		# enemy bullets can hit player (defensive, mostly used by tanks)
+		self.broadphase.rebuild(self.targets, self.bullets)
+		self.hit_targets()
 		if player:
-			for b in list(self.bullets):
-				if getattr(b, 'owner', None) == 'enemy':
-					dx = b.x - player.player_rect.centerx
-					dy = b.y - player.player_rect.centery
-					dist = (dx**2 + dy**2)**0.5
-					if dist <= b.radius + max(player.player_rect.width, player.player_rect.height) / 4:
-						b.alive = False
-						player.half_lives -= 2
-						player.take_hit()
+			self.hit_player(player)
 
-		self.bullets = [b for b in self.bullets if b.alive]
-
-		# vérifier les collisions du joueur (dégâts au contact des soldats 1 & 2)
-		if player:
-			now = pygame.time.get_ticks()
-			px = player.player_rect.centerx
-			py = player.player_rect.centery
-			for t in self.targets:
-				if t.alive and t.touch_damage > 0:
-					dx = t.x - px
-					dy = t.y - py
-					dist = (dx**2 + dy**2) ** 0.5
-					if dist <= t.radius + max(player.player_rect.width, player.player_rect.height) / 4:
-						# limiter le taux de contact par cible (1000ms pour éviter les doubles coups)
-						if now - t.last_touch_time > 1000:
-							t.last_touch_time = now
-							player.half_lives -= int(t.touch_damage * 2)
-							player.take_hit()
+		self.bullets.release_dead()
 
-		alive_targets = [t for t in self.targets if t.alive]
-		if len(alive_targets) == 0:
+		self.targets.compact()
+		if len(self.targets) == 0:
 			self.completed = True
 
-	def draw(self):
+	def hit_targets(self):
+		"""Les balles du joueur endommagent les cibles"""
+		for b, t in self.broadphase.bullet_target_pairs('player'):
+			if t.alive:
+				b.alive = False
+				t.hp -= 1
+				if t.hp <= 0:
+					t.alive = False
+				else:
+					# afficher l'indicateur de coup si l'ennemi survit
+					t.trigger_hit()
+
+	def hit_player(self, player):
+		px = player.player_rect.centerx
+		py = player.player_rect.centery
+		pr = collisions.player_radius(player)
+		# enemy bullets can hit player (defensive, mostly used by tanks)
+		for b in self.broadphase.bullets_near(px, py, pr, 'enemy'):
+			b.alive = False
+			player.half_lives -= 2
+			player.take_hit()
+
+		# vérifier les collisions du joueur (dégâts au contact des soldats 1 & 2)
+		now = sim_time.get_ticks()
+		for t in self.broadphase.targets_near(px, py, pr):
+			if t.alive and t.touch_damage > 0:
+				# limiter le taux de contact par cible (1000ms pour éviter les doubles coups)
+				if now - t.last_touch_time > 1000:
+					t.last_touch_time = now
+					player.half_lives -= int(t.touch_damage * 2)
+					player.take_hit()
+
+	def draw_background(self, surface):
 		w, h = self.screen.get_size()
-		bg_w, bg_h = self.background_img.get_size()
-		
-		scale = max(w / bg_w, h / bg_h)
-		new_w = int(bg_w * scale)
-		new_h = int(bg_h * scale)
-		
-		scaled_bg = pygame.transform.scale(self.background_img, (new_w, new_h))
-		x = (w - new_w) // 2
-		y = (h - new_h) // 2
-		self.screen.blit(scaled_bg, (x, y))
-		
+		scaled_bg, bg_pos = surface_cache.scaled.cover("lvl1.png", self.background_img, (w, h))
+		surface.blit(scaled_bg, bg_pos)
+
+	def draw_sprites(self):
+		# tous les blits de la frame partent en un seul Surface.blits()
+		batch = atlas.SpriteBatch(self.screen)
 		for t in self.targets:
 			if t.alive:
 				if t.image:
-					iw, ih = t.image.get_size()
-					self.screen.blit(t.image, (int(t.x - iw // 2), int(t.y - ih // 2)))
+					batch.blit_centered(t.image, t.x, t.y)
 				else:
-					pygame.draw.circle(self.screen, (255, 100, 100), (int(t.x), int(t.y)), t.radius)
+					batch.circle((255, 100, 100), (int(t.x), int(t.y)), t.radius)
 				# afficher l'indicateur de coup s'il est actif
 				if t.show_hit:
-					now = pygame.time.get_ticks()
+					now = sim_time.get_ticks()
 					if now - t.hit_time < t.hit_duration:
 						# draw hit image only
 						if Target.hit_img:
-							hiw, hih = Target.hit_img.get_size()
-							self.screen.blit(Target.hit_img, (int(t.x - hiw // 2), int(t.y - hih // 2)))
+							batch.blit_centered(Target.hit_img, t.x, t.y)
 					else:
 						t.show_hit = False
 		
@@ -278,8 +289,7 @@ class Level1(Level):
 			# utiliser l'image personnalisée si définie, sinon l'image de balle par défaut
 			img_to_use = b.custom_image if b.custom_image else Bullet.bullet_img
 			if img_to_use:
-				iw, ih = img_to_use.get_size()
-				self.screen.blit(img_to_use, (int(b.x - iw // 2), int(b.y - ih // 2)))
+				batch.blit_centered(img_to_use, b.x, b.y)
 			else:
-				pygame.draw.circle(self.screen, (255, 255, 0), (int(b.x), int(b.y)), b.radius)
-
+				batch.circle((255, 255, 0), (int(b.x), int(b.y)), b.radius)
+		return batch.flush()
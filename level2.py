@@ -1,6 +1,16 @@
 import pygame
 from pathlib import Path
 from level_base import Level
+import asset_registry
+import atlas
+import collisions
+import enemies
+import preloader
+from bullet_pool import BulletPool
+from swarm import TargetSwarm
+import input_source
+import sim_time
+import surface_cache
 import level1
 import random
 
@@ -10,12 +20,21 @@ ASSETS = Path(__file__).parent / "assets"
 class Level2(Level):
 	def __init__(self, screen):
 		super().__init__(screen)
-		self.background_img = pygame.image.load(str(ASSETS / "lvl2.png"))
-		self.targets = []
-		self.bullets = []
+		self.background_img = asset_registry.image("lvl2.png")
+		self.targets = TargetSwarm()
+		self.bullets = BulletPool()
+		level1.Bullet.load_images()
 		self.completed = False
 		self.spawn_targets()
 
+	@classmethod
+	def preload_jobs(cls):
+		return [
+			preloader.image_job("lvl2.png"),
+			preloader.sprite_job(enemies.SOLDAT2, 36),
+			preloader.sprite_job(enemies.SOLDAT3),
+		] + preloader.bullet_jobs()
+
 	def spawn_targets(self):
 		w, h = self.screen.get_size()
 		positions = [(i + 1) * w // 6 for i in range(5)]
@@ -24,32 +43,23 @@ class Level2(Level):
 			x = positions[i]
 			# randomiser légèrement la position Y
 			y = h // 3 + random.randint(-30, 30)
-			img = ASSETS / "soldat2.png"
-			# légèrement espacés, rayon plus grand pour correspondre au design du niveau
+			# légèrement espacés, rayon plus petit pour correspondre au design du niveau
 			# soldat2 cherche le joueur et inflige des dégâts au contact
-			t = level1.Target(x, y, image_path=img, hp=2, radius=36, seeks_player=True, touch_damage=0.5)
-			# randomiser davantage les mouvements des soldats
-			t.vx *= random.uniform(0.35, 0.55)
-			t.vy *= random.uniform(0.35, 0.55)
-			self.targets.append(t)
+			self.targets.append(enemies.SOLDAT2.spawn(x, y, radius=36))
 		# un soldat3 (hp=4)
 		x = positions[4]
-		img = ASSETS / "soldat3.png"
-		# soldat3 est un tank: plus grand et peut tirer sur le joueur
-		tank = level1.Target(x, y, image_path=img, hp=4, radius=70, can_shoot=True)
-		# make tank less likely to descend too low (we'll clamp in update)
-		tank.vy *= 0.5
-		self.targets.append(tank)
+		# soldat3 est un tank: plus grand et peut tirer sur le joueur (descente limitée dans update)
+		self.targets.append(enemies.SOLDAT3.spawn(x, y))
 
 	def shoot(self, player_rect):
-		mx, my = pygame.mouse.get_pos()
+		mx, my = input_source.get_mouse_pos()
 		dx = mx - player_rect.centerx
 		dy = my - player_rect.centery
 		dist = (dx**2 + dy**2)**0.5
 		if dist > 0:
 			dx /= dist
 			dy /= dist
-		self.bullets.append(level1.Bullet(player_rect.centerx, player_rect.centery, dx, dy, owner='player'))
+		self.bullets.spawn(player_rect.centerx, player_rect.centery, dx, dy, owner='player')
 
 	def handle_event(self, event):
 		if event.type == pygame.VIDEORESIZE:
@@ -63,115 +73,94 @@ class Level2(Level):
 		player_x = player.player_rect.centerx if player else w // 2
 		player_y = player.player_rect.centery if player else h // 2
 
-		for t in self.targets:
-			if t.alive:
-				t.update(dt, w, h, player_x, player_y)
-				# empêcher le tank de descendre trop bas
-				if t.can_shoot:
-					max_y = h * 0.6
-					if t.y > max_y:
-						t.y = max_y
-						if t.vy > 0:
-							# rebondir légèrement vers le haut
-							t.vy *= -0.4
-				# tank shooting behavior
-				if t.alive and t.can_shoot and player:
-					now = pygame.time.get_ticks()
-					# slower firing rate for the tank
-					if now - t.last_shot_time > 2200:
-						t.last_shot_time = now
-						dx = player_x - t.x
-						dy = player_y - t.y
-						dist = (dx**2 + dy**2) ** 0.5
-						if dist > 0:
-							dx /= dist
-							dy /= dist
-							# balle ennemie vers le joueur (plus lente)
-							self.bullets.append(level1.Bullet(t.x, t.y, dx, dy, speed=300, owner='enemy'))
-
-		for b in self.bullets:
-			b.update(dt)
-
-		self.bullets = [b for b in self.bullets if b.alive and 0 <= b.x <= w and 0 <= b.y <= h]
-
-		# les balles du joueur endommagent les cibles
-		for b in list(self.bullets):
-			if getattr(b, 'owner', 'player') == 'player':
-				for t in self.targets:
-					if t.alive:
-						dx = b.x - t.x
-						dy = b.y - t.y
-						dist = (dx**2 + dy**2)**0.5
-						if dist <= t.radius + b.radius:
-							b.alive = False
-							t.hp -= 1
-							if t.hp <= 0:
-								t.alive = False
-							else:
-								# afficher l'indicateur de coup si l'ennemi survit
-								t.trigger_hit()
-
-		self.bullets = [b for b in self.bullets if b.alive]
+		served = self.ai.select(self.targets, dt)
+		self.targets.step(dt, w, h, player_x, player_y, served)
+		# empêcher le tank de descendre trop bas (il rebondit légèrement vers le haut)
+		self.targets.limit_shooters(h * 0.6)
 
-		# vérifier les collisions du joueur (dégâts au contact des soldats 2)
+		# tank shooting behavior
 		if player:
-			now = pygame.time.get_ticks()
-			px = player.player_rect.centerx
-			py = player.player_rect.centery
-			for t in self.targets:
-				if t.alive and t.touch_damage > 0:
-					dx = t.x - px
-					dy = t.y - py
+			now = sim_time.get_ticks()
+			for t in self.targets.shooters(served):
+				# slower firing rate for the tank
+				if now - t.last_shot_time > 2200:
+					t.last_shot_time = now
+					dx = player_x - t.x
+					dy = player_y - t.y
 					dist = (dx**2 + dy**2) ** 0.5
-					if dist <= t.radius + max(player.player_rect.width, player.player_rect.height) / 4:
-						# limiter le taux de contact par cible (1000ms pour éviter les doubles coups)
-						if now - t.last_touch_time > 1000:
-							t.last_touch_time = now
-						player.half_lives -= int(t.touch_damage * 2)
-						player.take_hit()
-			for b in list(self.bullets):
-				if getattr(b, 'owner', None) == 'enemy':
-					dx = b.x - player.player_rect.centerx
-					dy = b.y - player.player_rect.centery
-					dist = (dx**2 + dy**2)**0.5
-					if dist <= b.radius + max(player.player_rect.width, player.player_rect.height) / 4:
-						b.alive = False
-						player.half_lives -= 2
-						player.take_hit()
-
-		self.bullets = [b for b in self.bullets if b.alive]
-		alive_targets = [t for t in self.targets if t.alive]
-		if len(alive_targets) == 0:
-			self.completed = True
+					if dist > 0:
+						dx /= dist
+						dy /= dist
+						# balle ennemie vers le joueur (plus lente)
+						self.bullets.spawn(t.x, t.y, dx, dy, speed=300, owner='enemy')
 
-	def draw(self):
-		w, h = self.screen.get_size()
-		bg_w, bg_h = self.background_img.get_size()
+		self.bullets.integrate(dt)
+		self.bullets.cull(w, h)
 
-		scale = max(w / bg_w, h / bg_h)
-		new_w = int(bg_w * scale)
-		new_h = int(bg_h * scale)
+		self.broadphase.rebuild(self.targets, self.bullets)
+		self.hit_targets()
 
-		scaled_bg = pygame.transform.scale(self.background_img, (new_w, new_h))
-		x = (w - new_w) // 2
-		y = (h - new_h) // 2
-		self.screen.blit(scaled_bg, (x, y))
+		self.bullets.release_dead()
+
+		if player:
+			self.hit_player(player)
 
+		self.bullets.release_dead()
+		self.targets.compact()
+		if len(self.targets) == 0:
+			self.completed = True
+
+	def hit_targets(self):
+		"""Les balles du joueur endommagent les cibles"""
+		for b, t in self.broadphase.bullet_target_pairs('player'):
+			if t.alive:
+				b.alive = False
+				t.hp -= 1
+				if t.hp <= 0:
+					t.alive = False
+				else:
+					# afficher l'indicateur de coup si l'ennemi survit
+					t.trigger_hit()
+
+	def hit_player(self, player):
+		# vérifier les collisions du joueur (dégâts au contact des soldats 2)
+		now = sim_time.get_ticks()
+		px = player.player_rect.centerx
+		py = player.player_rect.centery
+		pr = collisions.player_radius(player)
+		for t in self.broadphase.targets_near(px, py, pr):
+			if t.alive and t.touch_damage > 0:
+				# limiter le taux de contact par cible (1000ms pour éviter les doubles coups)
+				if now - t.last_touch_time > 1000:
+					t.last_touch_time = now
+				player.half_lives -= int(t.touch_damage * 2)
+				player.take_hit()
+		for b in self.broadphase.bullets_near(px, py, pr, 'enemy'):
+			b.alive = False
+			player.half_lives -= 2
+			player.take_hit()
+
+	def draw_background(self, surface):
+		w, h = self.screen.get_size()
+		scaled_bg, bg_pos = surface_cache.scaled.cover("lvl2.png", self.background_img, (w, h))
+		surface.blit(scaled_bg, bg_pos)
+
+	def draw_sprites(self):
+		# tous les blits de la frame partent en un seul Surface.blits()
+		batch = atlas.SpriteBatch(self.screen)
 		for t in self.targets:
 			if t.alive:
 				if t.image:
-					iw, ih = t.image.get_size()
-					self.screen.blit(t.image, (int(t.x - iw // 2), int(t.y - ih // 2)))
+					batch.blit_centered(t.image, t.x, t.y)
 				else:
-					pygame.draw.circle(self.screen, (255, 100, 100), (int(t.x), int(t.y)), t.radius)
+					batch.circle((255, 100, 100), (int(t.x), int(t.y)), t.radius)
 				# afficher l'indicateur de coup s'il est actif
 				if t.show_hit:
-					now = pygame.time.get_ticks()
+					now = sim_time.get_ticks()
 					if now - t.hit_time < t.hit_duration:
 						# draw hit image only
 						if level1.Target.hit_img:
-							hiw, hih = level1.Target.hit_img.get_size()
-							self.screen.blit(level1.Target.hit_img, (int(t.x - hiw // 2), int(t.y - hih // 2)))
+							batch.blit_centered(level1.Target.hit_img, t.x, t.y)
 					else:
 						t.show_hit = False
 
@@ -181,8 +170,7 @@ class Level2(Level):
 			if not img_to_use:
 				img_to_use = level1.Bullet.bullet_img
 			if img_to_use:
-				iw, ih = img_to_use.get_size()
-				self.screen.blit(img_to_use, (int(b.x - iw // 2), int(b.y - ih // 2)))
+				batch.blit_centered(img_to_use, b.x, b.y)
 			else:
-				pygame.draw.circle(self.screen, (255, 255, 0), (int(b.x), int(b.y)), b.radius)
-
+				batch.circle((255, 255, 0), (int(b.x), int(b.y)), b.radius)
+		return batch.flush()
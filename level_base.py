@@ -1,6 +1,22 @@
+import ai_scheduler
+import collisions
+
+
 class Level:
+	# nom affiché dans le menu (None: "MISSION" et le numéro du niveau)
+	title = None
+
 	def __init__(self, screen):
 		self.screen = screen
+		# détection de collisions (balayage du pool de balles), mise à jour à chaque pas par update()
+		self.broadphase = collisions.Broadphase()
+		# visée et tirs des ennemis, répartis sur plusieurs pas quand ils sont nombreux
+		self.ai = ai_scheduler.AIScheduler()
+
+	@classmethod
+	def preload_jobs(cls):
+		"""Tâches (libellé, fonction) qui décodent les assets du niveau, pour preloader"""
+		return []
 
 	def handle_event(self, event):
 		return None
@@ -9,4 +25,13 @@ class Level:
 		pass
 
 	def draw(self):
+		self.draw_background(self.screen)
+		self.draw_sprites()
+
+	def draw_background(self, surface):
+		"""Dessiner le fond (statique) du niveau sur surface"""
 		pass
+
+	def draw_sprites(self):
+		"""Dessiner tout ce qui bouge; renvoie la liste des rectangles modifiés"""
+		return []
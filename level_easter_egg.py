@@ -1,8 +1,16 @@
-import pygame
 from pathlib import Path
 from level_base import Level
+import asset_registry
+import atlas
+import collisions
+import enemies
+import preloader
+from bullet_pool import BulletPool
+from swarm import TargetSwarm
+import input_source
+import sim_time
+import surface_cache
 import level1
-import random
 
 ASSETS = Path(__file__).parent / "assets"
 
@@ -10,64 +18,53 @@ ASSETS = Path(__file__).parent / "assets"
 class LevelEasterEgg(Level):
 	def __init__(self, screen):
 		super().__init__(screen)
-		self.background_img = pygame.image.load(str(ASSETS / "Background_easter_egg.png"))
-		self.targets = []
-		self.bullets = []
+		self.background_img = asset_registry.image("Background_easter_egg.png")
+		self.targets = TargetSwarm()
+		self.bullets = BulletPool()
+		level1.Bullet.load_images()
 		self.completed = False
 		# précharger l'image de poing pour les balles du boss si nécessaire
 		if level1.Bullet.poing_img is None:
-			level1.Bullet.poing_img = pygame.image.load(str(ASSETS / "poing.png"))
-			level1.Bullet.poing_img = pygame.transform.scale(level1.Bullet.poing_img, (32, 32))
+			level1.Bullet.poing_img = atlas.get("poing")
 		self.spawn_targets()
 
+	@classmethod
+	def preload_jobs(cls):
+		return [
+			preloader.image_job("Background_easter_egg.png"),
+			preloader.sprite_job(enemies.BOSS_EASTER_EGG),
+		] + preloader.bullet_jobs()
+
 	def spawn_targets(self):
 		w, h = self.screen.get_size()
 		# Boss easter egg centré
 		boss_x = w // 2
 		boss_y = h // 3
 		
-		boss = level1.Target(
-			boss_x, boss_y, 
-			image_path=ASSETS / "boss_easter_egg.png", 
-			hp=50, 
-			radius=60, 
-			seeks_player=True, 
-			touch_damage=0,
-			can_shoot=True
-		)
-		# randomiser légèrement le mouvement du boss
-		boss.vx *= random.uniform(0.6, 0.9)
-		boss.vy *= random.uniform(0.6, 0.9)
-		boss.steer_strength = random.uniform(50, 70)
-		# pas d'invincibilité - le joueur peut tirer immédiatement
-		boss.invincible_duration = 0
+		# mouvement légèrement aléatoire, pas d'invincibilité - le joueur peut tirer immédiatement
+		boss = enemies.BOSS_EASTER_EGG.spawn(boss_x, boss_y)
 		boss.shoot_cooldown = 800  # tire rapidement (toutes les 0.8 secondes)
-		boss.last_shot = pygame.time.get_ticks()
+		boss.last_shot = sim_time.get_ticks()
 		boss.first_shot_done = False  # marqueur pour le premier tir
 		
 		self.targets.append(boss)
 
 	def update(self, dt, game=None):
 		w, h = self.screen.get_size()
-		now = pygame.time.get_ticks()
+		now = sim_time.get_ticks()
 		
 		# mettre à jour toutes les cibles (ennemis)
-		for t in self.targets:
-			if t.seeks_player and game:
-				# simple steering towards player
-				dx = game.player_rect.centerx - t.x
-				dy = game.player_rect.centery - t.y
-				dist = (dx**2 + dy**2)**0.5
-				if dist > 1:
-					t.vx += (dx / dist) * t.steer_strength * dt
-					t.vy += (dy / dist) * t.steer_strength * dt
-			
-			# mettre à jour la position
-			t.x += t.vx * dt
-			t.y += t.vy * dt
-			
-			# Tir du Boss
-			if t.can_shoot and game:
+		served = self.ai.select(self.targets, dt)
+		if game:
+			# simple steering towards player
+			self.targets.seek(dt, game.player_rect.centerx, game.player_rect.centery, min_dist=1, served=served)
+
+		# mettre à jour la position
+		self.targets.integrate(dt)
+
+		# Tir du Boss
+		if game:
+			for t in self.targets.shooters(served):
 				# Utiliser le cooldown normal
 				if now - t.last_shot > t.shoot_cooldown:
 					# tirer sur le joueur
@@ -75,110 +72,102 @@ class LevelEasterEgg(Level):
 					dy = game.player_rect.centery - t.y
 					dist = (dx**2 + dy**2)**0.5
 					if dist > 1:
-						bullet_vx = (dx / dist) * 250
-						bullet_vy = (dy / dist) * 250
-						bullet = level1.Bullet(t.x, t.y, bullet_vx, bullet_vy, speed=250, owner='enemy', custom_image=level1.Bullet.poing_img)
-						self.bullets.append(bullet)
+						self.bullets.spawn(t.x, t.y, dx / dist, dy / dist, speed=250, owner='enemy', custom_image=level1.Bullet.poing_img)
 						t.first_shot_done = True  # marquer que le premier tir est fait
 					t.last_shot = now
-			
-			# clamp to screen - boss reste dans le tiers supérieur
-			t.x = max(t.radius, min(w - t.radius, t.x))
-			t.y = max(t.radius, min(h // 3, t.y))  # ne descend pas plus bas que le tiers supérieur
-			
-			# mettre à jour l'indicateur de coup
+
+		# clamp to screen - boss reste dans le tiers supérieur
+		self.targets.clamp(w, h // 3)
+
+		# mettre à jour l'indicateur de coup
+		for t in self.targets:
 			if t.show_hit and now - t.hit_time > 400:
 				t.show_hit = False
 		
 		# update bullets
-		for b in self.bullets:
-			b.x += b.dx * dt
-			b.y += b.dy * dt
-			if b.x < 0 or b.x > w or b.y < 0 or b.y > h:
-				b.alive = False
-			
-			# vérifier si une balle ennemie touche le joueur (mort instantanée)
-			if getattr(b, 'owner', None) == 'enemy' and game and b.alive:
-				dx = b.x - game.player_rect.centerx
-				dy = b.y - game.player_rect.centery
-				dist = (dx**2 + dy**2)**0.5
-				hit_dist = b.radius + max(game.player_rect.width, game.player_rect.height) / 4
-				if dist <= hit_dist:
-					game.half_lives = 0  # mort instantanée
-					game.take_hit()
-					b.alive = False
+		self.bullets.integrate(dt)
+		self.bullets.cull(w, h)
 		
-		# vérifier les coups de balle sur les cibles (uniquement les balles du joueur)
-		for b in list(self.bullets):
-			if not b.alive or getattr(b, 'owner', None) == 'enemy':
-				continue
-			for t in self.targets:
-				# vérifier l'invincibilité au spawn
-				if now - t.spawn_time < t.invincible_duration:
-					continue
-				dx = b.x - t.x
-				dy = b.y - t.y
-				dist = (dx**2 + dy**2)**0.5
-				if dist <= b.radius + t.radius:
-					b.alive = False
-					t.hp -= 1
-					t.trigger_hit()
-					if t.hp <= 0:
-						self.targets.remove(t)
-					break
+		self.broadphase.rebuild(self.targets, self.bullets)
+		if game:
+			self.hit_player(game)
+		
+		self.hit_targets()
 		
 		# retirer les balles mortes
-		self.bullets = [b for b in self.bullets if b.alive]
+		self.bullets.release_dead()
 		
 		# check if all targets are dead
 		if len(self.targets) == 0:
 			self.completed = True
 
+	def hit_targets(self):
+		"""Coups de balle sur les cibles (uniquement les balles du joueur)"""
+		now = sim_time.get_ticks()
+		for b, t in self.broadphase.bullet_target_pairs('player'):
+			# une balle ne touche que la première cible; les cibles mortes sont déjà retirées
+			if not b.alive or not t.alive:
+				continue
+			# vérifier l'invincibilité au spawn
+			if now - t.spawn_time < t.invincible_duration:
+				continue
+			b.alive = False
+			t.hp -= 1
+			t.trigger_hit()
+			if t.hp <= 0:
+				t.alive = False
+				self.targets.remove(t)
+
+	def hit_player(self, game):
+		# vérifier si une balle ennemie touche le joueur (mort instantanée)
+		pr = collisions.player_radius(game)
+		for b in self.broadphase.bullets_near(game.player_rect.centerx, game.player_rect.centery, pr, 'enemy'):
+			if b.alive:
+				game.half_lives = 0  # mort instantanée
+				game.take_hit()
+				b.alive = False
+
 	def shoot(self, player_rect):
 		# le joueur tire depuis sa position
-		mouse_x, mouse_y = pygame.mouse.get_pos()
+		mouse_x, mouse_y = input_source.get_mouse_pos()
 		dx = mouse_x - player_rect.centerx
 		dy = mouse_y - player_rect.centery
 		dist = (dx**2 + dy**2)**0.5
 		if dist > 1:
-			speed = 600
-			vx = (dx / dist) * speed
-			vy = (dy / dist) * speed
-			bullet = level1.Bullet(player_rect.centerx, player_rect.centery, vx, vy, owner='player')
-			self.bullets.append(bullet)
+			self.bullets.spawn(player_rect.centerx, player_rect.centery, dx / dist, dy / dist, speed=600, owner='player')
 
-	def draw(self):
+	def draw_background(self, surface):
 		w, h = self.screen.get_size()
-		bg = pygame.transform.scale(self.background_img, (w, h))
-		self.screen.blit(bg, (0, 0))
-		
+		bg = surface_cache.scaled.stretch("Background_easter_egg.png", self.background_img, (w, h))
+		surface.blit(bg, (0, 0))
+
+	def draw_sprites(self):
+		# tous les blits de la frame partent en un seul Surface.blits()
+		batch = atlas.SpriteBatch(self.screen)
 		# dessiner les cibles
 		for t in self.targets:
 			if t.image:
-				img_rect = t.image.get_rect(center=(int(t.x), int(t.y)))
-				self.screen.blit(t.image, img_rect)
+				batch.blit(t.image, t.image.get_rect(center=(int(t.x), int(t.y))))
 				
 				# Dessiner l'indicateur de coup s'il est actif
 				if t.show_hit and hasattr(t, 'hit_img') and t.hit_img:
-					hit_rect = t.hit_img.get_rect(center=(int(t.x), int(t.y)))
-					self.screen.blit(t.hit_img, hit_rect)
+					batch.blit(t.hit_img, t.hit_img.get_rect(center=(int(t.x), int(t.y))))
 		
 		# dessiner les balles
 		for b in self.bullets:
 			# Use custom image if available
 			if hasattr(b, 'custom_image') and b.custom_image:
-				img_rect = b.custom_image.get_rect(center=(int(b.x), int(b.y)))
-				self.screen.blit(b.custom_image, img_rect)
+				batch.blit(b.custom_image, b.custom_image.get_rect(center=(int(b.x), int(b.y))))
 			elif hasattr(b, 'owner') and b.owner == 'player':
 				# Les balles du joueur utilisent l'image balle
 				if hasattr(level1.Bullet, 'bullet_img') and level1.Bullet.bullet_img:
-					img_rect = level1.Bullet.bullet_img.get_rect(center=(int(b.x), int(b.y)))
-					self.screen.blit(level1.Bullet.bullet_img, img_rect)
+					batch.blit(level1.Bullet.bullet_img, level1.Bullet.bullet_img.get_rect(center=(int(b.x), int(b.y))))
 				else:
-					pygame.draw.circle(self.screen, (255, 200, 0), (int(b.x), int(b.y)), b.radius)
+					batch.circle((255, 200, 0), (int(b.x), int(b.y)), b.radius)
 			else:
 				# Balles ennemies par défaut
-				pygame.draw.circle(self.screen, (255, 50, 50), (int(b.x), int(b.y)), b.radius)
+				batch.circle((255, 50, 50), (int(b.x), int(b.y)), b.radius)
+		return batch.flush()
 
 	def handle_event(self, event):
 		pass
@@ -0,0 +1,262 @@
+"""Niveau de charge: des vagues d'ennemis de plus en plus grandes, sans fin
+
+	python main.py                                   (HORDE dans le menu)
+	MMA_HORDE_IMMORTAL=1 python main.py              le joueur ne perd pas de vie
+	MMA_HORDE_IMMORTAL=1 python headless.py --level horde --seconds 300
+
+Une vague commence toutes les WAVE_SECONDS secondes (ou dès que la précédente est
+entièrement détruite). La vague n compte WAVE_SIZE * WAVE_GROWTH ** (n - 1) ennemis,
+tirés parmi les types déjà débloqués (WAVES), qui entrent par le haut de l'écran au
+fil de SPAWN_SECONDS secondes plutôt que tous au même pas. Le niveau n'est jamais
+terminé: il sert à trouver le nombre d'ennemis à partir duquel une machine ne tient
+plus 60 images par seconde. Le bandeau affiche la vague, le nombre d'ennemis et de
+balles, le coût moyen d'un pas de simulation du niveau et le retard de l'ordonnanceur
+d'IA (ai_scheduler).
+
+MMA_HORDE_IMMORTAL n'est pas noté dans les enregistrements (replay): rejouer une
+partie avec la même valeur que pendant l'enregistrement.
+"""
+import os
+import random
+import time
+import pygame
+from level_base import Level
+import asset_registry
+import atlas
+import collisions
+import enemies
+import preloader
+from bullet_pool import BulletPool
+from swarm import TargetSwarm
+import input_source
+import sim_time
+import surface_cache
+import text_cache
+import level1
+
+# (première vague, type, poids du tirage)
+WAVES = (
+	(1, enemies.SOLDAT1, 4),
+	(1, enemies.SOLDAT2, 3),
+	(2, enemies.SOLDAT3, 1),
+	(3, enemies.BOXEUR1, 1),
+	(3, enemies.BOXEUR2, 1),
+	(3, enemies.BOXEUR3, 1),
+	(5, enemies.BOSS, 0.5),
+)
+WAVE_SIZE = 8
+WAVE_GROWTH = 1.35
+WAVE_SECONDS = 15.0
+SPAWN_SECONDS = 8.0
+# ms entre deux tirs d'un tank ou d'un boss (comme aux niveaux 2 et 3)
+SHOT_INTERVAL = 2200
+# fréquence de mise à jour du bandeau (ms de jeu)
+STATS_REFRESH = 250
+
+
+class LevelHorde(Level):
+	title = "HORDE"
+
+	def __init__(self, screen, immortal=None):
+		super().__init__(screen)
+		self.background_img = asset_registry.image("lvl2.png")
+		self.targets = TargetSwarm()
+		self.bullets = BulletPool()
+		level1.Bullet.load_images()
+		# jamais terminé: la partie s'arrête à la mort du joueur ou par le menu pause
+		self.completed = False
+		if immortal is None:
+			immortal = os.environ.get("MMA_HORDE_IMMORTAL", "") not in ("", "0")
+		self.immortal = immortal
+		self.wave = 0
+		self.wave_start = 0
+		# ennemis de la vague en cours: à faire apparaître / déjà apparus
+		self.wave_total = 0
+		self.wave_spawned = 0
+		self.peak = 0
+		# coût de update() (s) accumulé depuis la dernière mise à jour du bandeau
+		self.cost = 0.0
+		self.cost_steps = 0
+		self.step_us = 0
+		self.stats_at = None
+		self.stats_lines = ()
+		self.start_wave()
+
+	@classmethod
+	def preload_jobs(cls):
+		return [
+			preloader.image_job("lvl2.png"),
+		] + [preloader.sprite_job(archetype) for _, archetype, _ in WAVES] + preloader.bullet_jobs()
+
+	def start_wave(self):
+		self.wave += 1
+		self.wave_start = sim_time.get_ticks()
+		self.wave_total = int(WAVE_SIZE * WAVE_GROWTH ** (self.wave - 1))
+		self.wave_spawned = 0
+
+	def spawn_due(self):
+		"""Faire entrer les ennemis de la vague prévus jusqu'à maintenant"""
+		elapsed = (sim_time.get_ticks() - self.wave_start) / 1000.0
+		due = min(self.wave_total, int(self.wave_total * elapsed / SPAWN_SECONDS) + 1)
+		if due <= self.wave_spawned:
+			return
+		w, _ = self.screen.get_size()
+		unlocked = [(archetype, weight) for first, archetype, weight in WAVES if first <= self.wave]
+		kinds = random.choices([a for a, _ in unlocked], weights=[wt for _, wt in unlocked], k=due - self.wave_spawned)
+		now = sim_time.get_ticks()
+		for archetype in kinds:
+			r = archetype.radius
+			t = archetype.spawn(random.uniform(r, max(r, w - r)), r)
+			# entrer vers le bas de l'écran
+			t.vy = abs(t.vy)
+			# premier tir une période après l'apparition, pas dès l'entrée
+			t.last_shot_time = now
+			self.targets.append(t)
+		self.wave_spawned = due
+
+	def shoot(self, player_rect):
+		mx, my = input_source.get_mouse_pos()
+		dx = mx - player_rect.centerx
+		dy = my - player_rect.centery
+		dist = (dx**2 + dy**2)**0.5
+		if dist > 0:
+			dx /= dist
+			dy /= dist
+		self.bullets.spawn(player_rect.centerx, player_rect.centery, dx, dy, owner='player')
+
+	def handle_event(self, event):
+		if event.type == pygame.VIDEORESIZE:
+			self.screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
+			return self.screen
+		return None
+
+	def update(self, dt, player=None):
+		start = time.perf_counter()
+		w, h = self.screen.get_size()
+
+		player_x = player.player_rect.centerx if player else w // 2
+		player_y = player.player_rect.centery if player else h // 2
+
+		now = sim_time.get_ticks()
+		wave_done = self.wave_spawned == self.wave_total and len(self.targets) == 0
+		if wave_done or now - self.wave_start >= WAVE_SECONDS * 1000:
+			self.start_wave()
+		self.spawn_due()
+
+		served = self.ai.select(self.targets, dt)
+		self.targets.step(dt, w, h, player_x, player_y, served)
+		# tanks et boss restent dans le haut de l'écran (voir niveaux 2 et 3)
+		self.targets.limit_shooters(h * 0.6)
+
+		if player:
+			for t in self.targets.shooters(served):
+				if now - t.last_shot_time > SHOT_INTERVAL:
+					t.last_shot_time = now
+					dx = player_x - t.x
+					dy = player_y - t.y
+					dist = (dx**2 + dy**2) ** 0.5
+					if dist > 0:
+						image = level1.Bullet.poing_img if t.archetype is enemies.BOSS else None
+						self.bullets.spawn(t.x, t.y, dx / dist, dy / dist, speed=300, owner='enemy', custom_image=image)
+
+		self.bullets.integrate(dt)
+		self.bullets.cull(w, h)
+
+		self.broadphase.rebuild(self.targets, self.bullets)
+		self.hit_targets()
+		if player:
+			self.hit_player(player)
+
+		self.bullets.release_dead()
+		self.targets.compact()
+		self.peak = max(self.peak, len(self.targets))
+
+		self.cost += time.perf_counter() - start
+		self.cost_steps += 1
+
+	def hit_targets(self):
+		"""Les balles du joueur endommagent les cibles (sauf pendant leur protection au spawn)"""
+		now = sim_time.get_ticks()
+		for b, t in self.broadphase.bullet_target_pairs('player'):
+			if not b.alive or not t.alive:
+				continue
+			if now - t.spawn_time < t.invincible_duration:
+				continue
+			b.alive = False
+			t.hp -= 1
+			if t.hp <= 0:
+				t.alive = False
+			else:
+				t.trigger_hit()
+
+	def hit_player(self, player):
+		px = player.player_rect.centerx
+		py = player.player_rect.centery
+		pr = collisions.player_radius(player)
+		for b in self.broadphase.bullets_near(px, py, pr, 'enemy'):
+			b.alive = False
+			if not self.immortal:
+				player.half_lives -= 2
+				player.take_hit()
+
+		if self.immortal:
+			return
+		now = sim_time.get_ticks()
+		for t in self.broadphase.targets_near(px, py, pr):
+			if t.alive and t.touch_damage > 0:
+				# au plus un coup par seconde et par ennemi
+				if now - t.last_touch_time > 1000:
+					t.last_touch_time = now
+					player.half_lives -= int(t.touch_damage * 2)
+					player.take_hit()
+
+	def draw_background(self, surface):
+		w, h = self.screen.get_size()
+		scaled_bg, bg_pos = surface_cache.scaled.cover("lvl2.png", self.background_img, (w, h))
+		surface.blit(scaled_bg, bg_pos)
+
+	def refresh_stats(self):
+		"""Recomposer le bandeau quelques fois par seconde (les compteurs changent à chaque pas)"""
+		now = sim_time.get_ticks()
+		if self.stats_at is not None and now - self.stats_at < STATS_REFRESH:
+			return
+		self.stats_at = now
+		if self.cost_steps:
+			self.step_us = int(self.cost / self.cost_steps * 1e6)
+			self.cost = 0.0
+			self.cost_steps = 0
+		# la police du jeu n'a pas de ponctuation: nombres entiers, microsecondes
+		self.stats_lines = (
+			f"VAGUE  {self.wave}    ENNEMIS  {len(self.targets)}    BALLES  {len(self.bullets)}",
+			f"SIMULATION  {self.step_us}  US PAR PAS    MAX  {self.peak}",
+			f"IA  {self.ai.served}  SUR  {self.ai.agents}  PAR PAS    RETARD  {int(self.ai.lag_ms)}  MS",
+		)
+
+	def draw_sprites(self):
+		# tous les blits de la frame partent en un seul Surface.blits()
+		batch = atlas.SpriteBatch(self.screen)
+		now = sim_time.get_ticks()
+		for t in self.targets:
+			if t.alive:
+				if t.image:
+					batch.blit_centered(t.image, t.x, t.y)
+				else:
+					batch.circle((255, 100, 100), (int(t.x), int(t.y)), t.radius)
+				if t.show_hit:
+					if now - t.hit_time < t.hit_duration:
+						if level1.Target.hit_img:
+							batch.blit_centered(level1.Target.hit_img, t.x, t.y)
+					else:
+						t.show_hit = False
+
+		for b in self.bullets:
+			img_to_use = b.custom_image if b.custom_image else level1.Bullet.bullet_img
+			if img_to_use:
+				batch.blit_centered(img_to_use, b.x, b.y)
+			else:
+				batch.circle((255, 255, 0), (int(b.x), int(b.y)), b.radius)
+
+		self.refresh_stats()
+		for i, line in enumerate(self.stats_lines):
+			batch.blit(text_cache.render(line, 30, (255, 255, 255)), (10, 50 + i * 32))
+		return batch.flush()
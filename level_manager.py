@@ -1,23 +1,66 @@
+import pygame
+import preloader
 from level1 import Level1
 from level2 import Level2
 from level3 import Level3
+from level_horde import LevelHorde
 
 
 class LevelManager:
 	def __init__(self, screen):
 		self.screen = screen
-		self.levels = [Level1, Level2, Level3]
+		# niveaux enchaînés de la campagne, puis les niveaux à part (choisis dans le menu)
+		self.campaign = [Level1, Level2, Level3]
+		self.levels = self.campaign + [LevelHorde]
 		self.completed_levels = []
 		self.current_index = 0
 		self.current = None
+		# préchargement du niveau suivant pendant un écran de transition
+		self.pending = None  # (index, Preloader) en cours
+		self.prefetched = None  # (index, niveau déjà construit)
 		self.load(self.current_index)
 
 	def load(self, index):
 		if index < 0 or index >= len(self.levels):
 			return
 		self.current_index = index
-		level_cls = self.levels[index]
-		self.current = level_cls(self.screen)
+		self.finish_prefetch(index)
+		if self.prefetched and self.prefetched[0] == index:
+			self.current = self.prefetched[1]
+		else:
+			level_cls = self.levels[index]
+			self.current = level_cls(self.screen)
+		self.prefetched = None
+
+	def prefetch(self, index):
+		"""Commencer à décoder les assets du niveau index dans un thread"""
+		if index < 0 or index >= len(self.levels):
+			return
+		self.prefetched = None
+		self.pending = (index, preloader.Preloader(self.levels[index].preload_jobs()).start())
+
+	def discard_prefetch(self):
+		"""Oublier le niveau préchargé: le prochain load() le reconstruit (graine fixée juste avant)"""
+		self.finish_prefetch(-1)
+		self.prefetched = None
+
+	def poll_prefetch(self):
+		"""À appeler à chaque frame d'un écran de transition: construit le niveau dès que ses assets sont prêts"""
+		if self.pending and self.pending[1].finished():
+			self.finish_prefetch(self.pending[0])
+
+	def finish_prefetch(self, index):
+		if not self.pending:
+			return
+		pending_index, loader = self.pending
+		self.pending = None
+		loader.finish()
+		if pending_index != index:
+			return
+		level = self.levels[index](self.screen)
+		# mettre à l'échelle le fond maintenant plutôt qu'à la première frame de jeu
+		level.draw_background(pygame.Surface(self.screen.get_size()))
+		self.prefetched = (index, level)
 
 	def mark_completed(self):
 		if self.current_index not in self.completed_levels:
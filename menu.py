@@ -1,5 +1,8 @@
 import pygame
 from pathlib import Path
+import asset_registry
+import text_cache
+import surface_cache
 
 ASSETS = Path(__file__).parent / "assets"
 
@@ -10,11 +13,12 @@ class Menu:
 		self.levels = levels
 		self.completed_levels = completed_levels
 		self.selected = 0
-		self.font = pygame.font.Font(str(ASSETS / "ARCADECLASSIC.TTF"), 40)
-		self.big_font = pygame.font.Font(str(ASSETS / "ARCADECLASSIC.TTF"), 60)
-		self.control_font = pygame.font.Font(str(ASSETS / "ARCADECLASSIC.TTF"), 30)
+		# tailles de police (les polices et les textes rendus sont mis en cache par text_cache)
+		self.font = 40
+		self.big_font = 60
+		self.control_font = 30
 		
-		self.background_img = pygame.image.load(str(ASSETS / "fondmenu.png"))
+		self.background_img = asset_registry.image("fondmenu.png")
 		
 		pygame.mixer.music.load(str(ASSETS / "menu.mp3"))
 		pygame.mixer.music.set_volume(0.3)
@@ -33,12 +37,16 @@ class Menu:
 	def draw(self):
 		w, h = self.screen.get_size()
 		
-		scaled_bg = pygame.transform.scale(self.background_img, (w, h))
+		scaled_bg = surface_cache.scaled.stretch("fondmenu.png", self.background_img, (w, h))
 		self.screen.blit(scaled_bg, (0, 0))
 		
 		# Left side: Mission list
 		left_x = w // 4
-		mission_names = ["MISSION  1", "MISSION  2", "MISSION  3"]
+		# nom affiché par le niveau (Level.title), sinon son numéro de mission
+		mission_names = [level.title or f"MISSION  {i + 1}" for i, level in enumerate(self.levels)]
+		# espacement réduit pour que la liste reste au-dessus de l'instruction du bas,
+		# jamais moins d'une ligne de texte (fenêtre très basse)
+		spacing = max(text_cache.font(self.font).get_height(), min(100, (h - 130 - h // 3) // len(self.levels)))
 		
 		# Draw missions
 		for i in range(len(self.levels)):
@@ -49,8 +57,8 @@ class Menu:
 				color = (200, 200, 200)
 				size_font = self.font
 			
-			text = size_font.render(mission_names[i], True, color)
-			y = h // 3 + 50 + i * 100
+			text = text_cache.render(mission_names[i], size_font, color)
+			y = h // 3 + 50 + i * spacing
 			self.screen.blit(text, (left_x - text.get_width() // 2, y))
 		
 		# Right side: Controls
@@ -70,15 +78,15 @@ class Menu:
 		y_offset = h // 3 + 30
 		for control in controls:
 			if control == "CONTROLES":
-				text = self.font.render(control, True, (255, 200, 100))
+				text = text_cache.render(control, self.font, (255, 200, 100))
 			elif control == "":
 				y_offset += 10
 				continue
 			else:
-				text = self.control_font.render(control, True, (200, 200, 200))
+				text = text_cache.render(control, self.control_font, (200, 200, 200))
 			self.screen.blit(text, (right_x - text.get_width() // 2, y_offset))
 			y_offset += 45
 		
 		# Bottom instruction
-		instr = self.control_font.render("ENTREE  :  JOUER", True, (150, 150, 150))
+		instr = text_cache.render("ENTREE  :  JOUER", self.control_font, (150, 150, 150))
 		self.screen.blit(instr, (w // 2 - instr.get_width() // 2, h - 60))
@@ -0,0 +1,92 @@
+"""Chargement des assets dans un thread pendant que l'écran de chargement s'affiche
+
+Une tâche est un couple (libellé, fonction). Le thread de chargement les exécute dans
+l'ordre; les images qu'il décode sont converties au format de l'écran par le thread
+principal, dans finish() (voir asset_registry.convert_pending).
+"""
+import threading
+import asset_registry
+import sound_bank
+
+
+def image_job(name, size=None, smooth=False):
+	return (name, lambda: asset_registry.image(name, size, smooth))
+
+
+def gif_job(name):
+	return (name, lambda: asset_registry.gif_frames(name))
+
+
+def sprite_job(archetype, radius=None):
+	return (archetype.name, lambda: archetype.sprite(radius))
+
+
+def sounds_job():
+	return ("sons", sound_bank.bank.load)
+
+
+class Preloader:
+	def __init__(self, jobs):
+		self.jobs = list(jobs)
+		self.done = 0
+		self.current = None
+		self.error = None
+		self.thread = None
+
+	def start(self):
+		self.thread = threading.Thread(target=self._run, name="preloader", daemon=True)
+		self.thread.start()
+		return self
+
+	def _run(self):
+		try:
+			for label, job in self.jobs:
+				self.current = label
+				job()
+				self.done += 1
+		except Exception as exc:
+			# relancée dans le thread principal par finish()
+			self.error = exc
+		self.current = None
+
+	@property
+	def progress(self):
+		"""Fraction des tâches terminées (0 à 1)"""
+		return self.done / len(self.jobs) if self.jobs else 1.0
+
+	def finished(self):
+		return self.thread is None or not self.thread.is_alive()
+
+	def finish(self):
+		"""Attendre la fin du chargement puis convertir ce qu'il a décodé (thread principal)"""
+		if self.thread is not None:
+			self.thread.join()
+		asset_registry.convert_pending()
+		if self.error is not None:
+			raise self.error
+
+
+def startup_jobs():
+	"""Ce qu'il faut avant le menu et le premier niveau"""
+	from level1 import Level1
+
+	return [
+		sounds_job(),
+		image_job("fondmenu.png"),
+		# joueur et interface (bsd.BSD)
+		image_job("joueur.png", (128, 128)),
+		image_job("persotouche.png", (128, 128)),
+		image_job("hp.png", (50, 50)),
+		image_job("mihp.png", (50, 50)),
+		image_job("balle.png", (28, 28)),
+		image_job("over.png"),
+	] + Level1.preload_jobs()
+
+
+def bullet_jobs():
+	"""Images communes à tous les niveaux (level1.Bullet, level1.Target)"""
+	return [
+		image_job("balle.png", (24, 24)),
+		image_job("poing.png", (32, 32)),
+		image_job("hit.png", (100, 100)),
+	]
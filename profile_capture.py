@@ -0,0 +1,114 @@
+"""Capture cProfile déclenchée en jeu (F5), limitée aux frames de gameplay
+
+F5 démarre la capture, un second F5 l'arrête et écrit deux fichiers:
+
+	profile_<date>.pstats     python -m pstats, snakeviz...
+	profile_<date>.collapsed  piles échantillonnées, une ligne "a;b;c nombre" (flamegraph.pl, speedscope)
+
+La boucle de jeu encadre chaque frame de gameplay par frame_begin() / frame_end():
+le profileur n'est actif qu'entre les deux, si bien que menus, pauses et écrans de
+transition n'apparaissent pas dans les résultats. Pendant ces mêmes frames, un
+thread relève la pile du thread principal toutes les interval secondes. Pour lire
+les piles, ce thread doit obtenir le GIL: pendant la capture, l'intervalle de
+bascule entre threads (sys.setswitchinterval, 5 ms par défaut) est ramené à interval,
+sans quoi le code Python du jeu ne le céderait qu'environ 200 fois par seconde. Les
+nombres du fichier .collapsed sont des échantillons, pas des millisecondes: leur
+cadence réelle dépend de la machine.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+def _stack_key(frame):
+	"""Pile d'appels de frame, de la racine à la fonction en cours, au format replié"""
+	names = []
+	while frame is not None:
+		code = frame.f_code
+		names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+		frame = frame.f_back
+	return ";".join(reversed(names))
+
+
+class ProfileCapture:
+	def __init__(self, interval=0.001):
+		self.interval = interval
+		self.profile = None
+		self.samples = Counter()
+		self.in_frame = False
+		self.frames = 0
+		self.sampler = None
+		self.stop_sampling = threading.Event()
+		# intervalle de bascule entre threads à rétablir à l'arrêt
+		self.switch_interval = None
+		self.main_ident = threading.main_thread().ident
+
+	@property
+	def active(self):
+		return self.profile is not None
+
+	def start(self):
+		if self.active:
+			return
+		self.profile = cProfile.Profile()
+		self.samples = Counter()
+		self.frames = 0
+		self.stop_sampling.clear()
+		self.switch_interval = sys.getswitchinterval()
+		sys.setswitchinterval(self.interval)
+		self.sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+		self.sampler.start()
+
+	def stop(self, prefix=None):
+		"""Arrêter la capture et écrire les fichiers; renvoie leurs chemins"""
+		if not self.active:
+			return None
+		self.frame_end()
+		self.stop_sampling.set()
+		self.sampler.join()
+		sys.setswitchinterval(self.switch_interval)
+		if prefix is None:
+			prefix = time.strftime("profile_%Y%m%d_%H%M%S")
+		stats_path = prefix + ".pstats"
+		collapsed_path = prefix + ".collapsed"
+		self.profile.dump_stats(stats_path)
+		with open(collapsed_path, "w") as f:
+			for stack, count in sorted(self.samples.items()):
+				f.write(f"{stack} {count}\n")
+		self.profile = None
+		self.sampler = None
+		return stats_path, collapsed_path
+
+	def toggle(self):
+		"""Démarrer ou arrêter la capture; renvoie les fichiers écrits à l'arrêt"""
+		if self.active:
+			return self.stop()
+		self.start()
+		return None
+
+	def frame_begin(self):
+		if self.active and not self.in_frame:
+			self.in_frame = True
+			self.frames += 1
+			self.profile.enable()
+
+	def frame_end(self):
+		"""Fin de la partie mesurée de la frame (avant l'attente, une transition, une pause...)"""
+		if self.in_frame:
+			self.profile.disable()
+			self.in_frame = False
+
+	def _sample(self):
+		while not self.stop_sampling.wait(self.interval):
+			if not self.in_frame:
+				continue
+			frame = sys._current_frames().get(self.main_ident)
+			if frame is not None:
+				self.samples[_stack_key(frame)] += 1
+
+
+# capture partagée par la boucle de jeu
+capture = ProfileCapture()
@@ -0,0 +1,116 @@
+import pygame
+import text_cache
+import frame_profiler
+from frame_profiler import profiler
+from hud import draw_hud, draw_reticle
+
+FULL = "full"
+DIRTY = "dirty"
+
+
+class Renderer:
+	"""Rendu d'une frame de jeu, soit en plein écran (flip), soit par rectangles modifiés
+
+	En mode DIRTY le fond du niveau est mis en cache dans une surface de la taille
+	de l'écran: à chaque frame on ne restaure que les zones où des sprites étaient
+	dessinés à la frame précédente, puis on ne présente que ces zones.
+	"""
+
+	def __init__(self, mode=FULL, show_stats=False, show_profile=False):
+		self.mode = mode
+		self.show_stats = show_stats
+		# panneau des temps par phase (frame_profiler)
+		self.show_profile = show_profile
+		self.background = None
+		# (niveau, taille de l'écran) pour lequel le fond en cache est valide
+		self.background_key = None
+		self.prev_rects = []
+		# statistiques de la dernière frame
+		self.last_rect_count = 0
+		self.last_repaint_ratio = 1.0
+
+	def toggle_mode(self):
+		self.mode = DIRTY if self.mode == FULL else FULL
+		self.invalidate()
+
+	def invalidate(self):
+		"""Forcer un rafraîchissement complet à la prochaine frame (pause, menu, transition...)"""
+		self.background_key = None
+		self.prev_rects = []
+
+	def draw_frame(self, screen, level, game, mouse_pos):
+		if self.mode == DIRTY:
+			self._draw_dirty(screen, level, game, mouse_pos)
+		else:
+			self._draw_full(screen, level, game, mouse_pos)
+
+	def _draw_full(self, screen, level, game, mouse_pos):
+		screen.fill((0, 0, 0))
+		level.draw()
+		profiler.lap("levels.draw")
+		game.draw()
+		profiler.lap("joueur")
+		# Interface
+		draw_hud(screen, game)
+		profiler.lap("draw_hud")
+		draw_reticle(screen, mouse_pos)
+		if self.show_stats:
+			self._draw_stats(screen)
+		if self.show_profile:
+			frame_profiler.overlay.draw(screen)
+		profiler.lap("overlay")
+		self.last_rect_count = 1
+		self.last_repaint_ratio = 1.0
+		pygame.display.flip()
+		profiler.lap("flip")
+
+	def _draw_dirty(self, screen, level, game, mouse_pos):
+		size = screen.get_size()
+		key = (id(level), size)
+		if key != self.background_key:
+			# nouveau niveau ou fenêtre redimensionnée: reconstruire le fond et tout redessiner
+			self.background = pygame.Surface(size).convert()
+			self.background.fill((0, 0, 0))
+			level.draw_background(self.background)
+			self.background_key = key
+			screen.blit(self.background, (0, 0))
+			self.prev_rects = []
+			full_repaint = True
+		else:
+			# effacer les sprites de la frame précédente en recopiant le fond
+			screen.blits([(self.background, r, r) for r in self.prev_rects], doreturn=False)
+			full_repaint = False
+
+		rects = list(level.draw_sprites())
+		profiler.lap("levels.draw")
+		rects.append(game.draw())
+		profiler.lap("joueur")
+		rects.append(draw_hud(screen, game))
+		profiler.lap("draw_hud")
+		rects.append(draw_reticle(screen, mouse_pos))
+		if self.show_stats:
+			rects.append(self._draw_stats(screen))
+		if self.show_profile:
+			rects.append(frame_profiler.overlay.draw(screen))
+		profiler.lap("overlay")
+
+		screen_rect = screen.get_rect()
+		rects = [r.clip(screen_rect) for r in rects if r]
+		dirty = self.prev_rects + rects
+		self.prev_rects = rects
+
+		if full_repaint:
+			self.last_rect_count = 1
+			self.last_repaint_ratio = 1.0
+			pygame.display.flip()
+		else:
+			area = sum(r.width * r.height for r in dirty)
+			self.last_rect_count = len(dirty)
+			self.last_repaint_ratio = min(1.0, area / float(screen_rect.width * screen_rect.height))
+			pygame.display.update(dirty)
+		profiler.lap("flip")
+
+	def _draw_stats(self, screen):
+		label = "FLIP" if self.mode == FULL else "DIRTY"
+		text = text_cache.render(f"{label}  {self.last_rect_count}  {int(self.last_repaint_ratio * 100)}", 24, (0, 255, 255))
+		return screen.blit(text, (10, screen.get_height() - text.get_height() - 8))
@@ -0,0 +1,309 @@
+"""Enregistrement et rejeu déterministe d'une partie
+
+	MMA_RECORD=partie.mmar python main.py       enregistre le premier niveau joué après le menu
+	MMA_RECORD=partie.mmar MMA_SEED=42 python main.py
+	python replay.py partie.mmar --repeat 5     rejoue sans affichage et mesure le temps
+
+Un enregistrement couvre un niveau, du lancement depuis le menu jusqu'à sa fin (victoire,
+défaite, retour au menu, easter egg ou fermeture). Il contient la graine du module random,
+le niveau, la taille de la fenêtre et le pas de simulation, puis une suite
+d'enregistrements (pas, type, a, b):
+
+	EVENT_MOUSE    clic transmis au jeu (a: bouton)
+	EVENT_KEY      touche transmise au jeu (a: code)
+	EVENT_RESIZE   fenêtre redimensionnée (a, b: taille)
+	KEYS           touches de déplacement tenues à partir de ce pas (a: masque de TRACKED_KEYS)
+	MOUSE          nouvelle position lue par input_source.get_mouse_pos() (a, b), au moment d'un tir
+
+Les enregistrements sont rattachés au pas de simulation avant lequel ils ont été faits
+et gardent leur ordre; le rejeu les applique au même moment (une position de souris ou
+un état du clavier reste valable jusqu'au suivant), si bien que la partie rejouée est
+identique pas pour pas.
+"""
+import random
+import struct
+import sys
+import time
+import pygame
+import input_source
+import sim_time
+
+MAGIC = b"MMAR"
+VERSION = 1
+# magic, version, graine, pas (s), largeur, hauteur, nombre de pas, longueur du nom de niveau
+HEADER = struct.Struct("<4sHIdHHIB")
+# pas, type, a, b
+RECORD = struct.Struct("<IBii")
+
+EVENT_MOUSE = 1
+EVENT_KEY = 2
+EVENT_RESIZE = 3
+KEYS = 4
+MOUSE = 5
+
+# touches lues par BSD.update (bit i du masque: TRACKED_KEYS[i])
+TRACKED_KEYS = (pygame.K_LEFT, pygame.K_RIGHT)
+
+
+def keys_mask(pressed):
+	mask = 0
+	for i, key in enumerate(TRACKED_KEYS):
+		if pressed[key]:
+			mask |= 1 << i
+	return mask
+
+
+def mask_keys(mask):
+	return input_source.PressedKeys(key for i, key in enumerate(TRACKED_KEYS) if mask & (1 << i))
+
+
+def reset_player(game):
+	"""Joueur dans l'état d'un début de niveau (vies, munitions, minuteurs, position)"""
+	game.half_lives = 6
+	game.ammo = game.max_ammo
+	game.reloading = False
+	game.reload_remaining = 0.0
+	game.is_hit = False
+	game.hit_timer = 0.0
+	game.center_player()
+
+
+class Recording:
+	def __init__(self, seed, level, dt, size, ticks=0, records=None):
+		self.seed = seed
+		# nom de la classe du niveau (voir levels())
+		self.level = level
+		self.dt = dt
+		self.size = tuple(size)
+		self.ticks = ticks
+		self.records = records if records is not None else []
+
+	def save(self, path):
+		name = self.level.encode()
+		with open(path, "wb") as f:
+			f.write(HEADER.pack(MAGIC, VERSION, self.seed, self.dt, self.size[0], self.size[1], self.ticks, len(name)))
+			f.write(name)
+			f.write(b"".join(RECORD.pack(*r) for r in self.records))
+
+	@classmethod
+	def load(cls, path):
+		with open(path, "rb") as f:
+			data = f.read()
+		magic, version, seed, dt, w, h, ticks, name_len = HEADER.unpack_from(data)
+		if magic != MAGIC or version != VERSION:
+			raise ValueError(f"{path}: pas un enregistrement de partie (version {VERSION})")
+		offset = HEADER.size
+		level = data[offset:offset + name_len].decode()
+		offset += name_len
+		records = [r for r in RECORD.iter_unpack(data[offset:])]
+		return cls(seed, level, dt, (w, h), ticks, records)
+
+
+class Recorder:
+	"""Enregistre une partie jouée dans main.py
+
+	start() fixe la graine et l'horloge de simulation et remplace les sources d'entrée
+	par des sources qui lisent la vraie souris et le vrai clavier en notant ce qu'elles
+	renvoient; la boucle de jeu signale les événements transmis au jeu (event) et la
+	fin de chaque pas (step_done).
+	"""
+
+	def __init__(self, path, seed=None):
+		# sans chemin, l'enregistreur ne fait rien
+		self.path = path
+		# la graine est écrite sur 32 bits non signés: MMA_SEED=-1 devient 0xFFFFFFFF
+		self.seed = (seed if seed is not None else int(time.time())) & 0xFFFFFFFF
+		self.recording = None
+		# un seul niveau par fichier: rien n'est enregistré après le premier
+		self.written = False
+		self.tick = 0
+		self.last_keys = None
+		self.last_mouse = None
+
+	@property
+	def active(self):
+		return self.recording is not None
+
+	def start(self, dt, size):
+		"""À appeler juste avant de construire le niveau: tout ce qui suit est tiré de la graine
+
+		Renvoie True si l'enregistrement commence.
+		"""
+		if not self.path or self.written or self.active:
+			return False
+		random.seed(self.seed)
+		sim_time.reset()
+		self.recording = Recording(self.seed, "", dt, size)
+		self.tick = 0
+		self.last_keys = None
+		self.last_mouse = None
+		input_source.set_mouse_source(self._mouse)
+		input_source.set_keys_source(self._keys)
+		return True
+
+	def set_level(self, level):
+		if self.active:
+			self.recording.level = type(level).__name__
+
+	def _add(self, kind, a=0, b=0):
+		self.recording.records.append((self.tick, kind, a, b))
+
+	def _mouse(self):
+		pos = pygame.mouse.get_pos()
+		if pos != self.last_mouse:
+			self._add(MOUSE, *pos)
+			self.last_mouse = pos
+		return pos
+
+	def _keys(self):
+		pressed = pygame.key.get_pressed()
+		mask = keys_mask(pressed)
+		if mask != self.last_keys:
+			self._add(KEYS, mask)
+			self.last_keys = mask
+		return pressed
+
+	def event(self, event):
+		"""Événement transmis au joueur ou au niveau (les mouvements de souris ne sont pas notés)"""
+		if not self.active:
+			return
+		if event.type == pygame.MOUSEBUTTONDOWN:
+			# position de la souris pour ce tir, notée avant l'événement qui la lira
+			self._mouse()
+			self._add(EVENT_MOUSE, getattr(event, 'button', 1))
+		elif event.type == pygame.KEYDOWN:
+			# Espace tire la balle spéciale vers la souris
+			if event.key == pygame.K_SPACE:
+				self._mouse()
+			self._add(EVENT_KEY, event.key)
+		elif event.type == pygame.VIDEORESIZE:
+			self._add(EVENT_RESIZE, event.w, event.h)
+
+	def step_done(self):
+		if self.active:
+			self.tick += 1
+
+	def stop(self):
+		"""Écrire l'enregistrement et rendre la main aux vraies entrées; renvoie le chemin"""
+		if not self.active:
+			return None
+		self.recording.ticks = self.tick
+		self.recording.save(self.path)
+		self.recording = None
+		self.written = True
+		input_source.set_mouse_source(None)
+		input_source.set_keys_source(None)
+		return self.path
+
+
+def dispatch(game, level, event):
+	"""Transmettre un événement au joueur et au niveau comme la boucle de main.py"""
+	if event.type == pygame.KEYDOWN:
+		if event.key == pygame.K_SPACE:
+			if hasattr(level, 'shoot_special'):
+				level.shoot_special(game.player_rect)
+		elif game.handle_event(event) == "shoot" and hasattr(level, 'shoot'):
+			level.shoot(game.player_rect)
+	else:
+		if game.handle_event(event) == "shoot" and hasattr(level, 'shoot'):
+			level.shoot(game.player_rect)
+		level.handle_event(event)
+
+
+def _event(kind, a, b):
+	if kind == EVENT_MOUSE:
+		return pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=a, pos=(0, 0))
+	if kind == EVENT_KEY:
+		return pygame.event.Event(pygame.KEYDOWN, key=a, mod=0, unicode="", scancode=0)
+	return pygame.event.Event(pygame.VIDEORESIZE, w=a, h=b, size=(a, b))
+
+
+def levels():
+	from level1 import Level1
+	from level2 import Level2
+	from level3 import Level3
+	from level_easter_egg import LevelEasterEgg
+	from level_horde import LevelHorde
+	return {cls.__name__: cls for cls in (Level1, Level2, Level3, LevelEasterEgg, LevelHorde)}
+
+
+def play(recording, on_tick=None):
+	"""Rejouer recording sans affichage; renvoie (joueur, niveau, issue, durée réelle en s)
+
+	on_tick(tick, game, level), s'il est donné, est appelé après chaque pas.
+	"""
+	import headless
+	import simulation
+	from bsd import BSD
+
+	screen = headless.init_display(recording.size)
+	random.seed(recording.seed)
+	sim_time.reset()
+	game = BSD(screen)
+	reset_player(game)
+	level = levels()[recording.level](screen)
+
+	# état courant des entrées, mis à jour par les enregistrements MOUSE et KEYS
+	mouse = [(0, 0)]
+	keys = [input_source.PressedKeys()]
+	input_source.set_mouse_source(lambda: mouse[0])
+	input_source.set_keys_source(lambda: keys[0])
+
+	events = recording.records
+	next_event = 0
+	outcome = None
+	start = time.perf_counter()
+	try:
+		for tick in range(recording.ticks):
+			while next_event < len(events) and events[next_event][0] == tick:
+				_, kind, a, b = events[next_event]
+				next_event += 1
+				if kind == MOUSE:
+					mouse[0] = (a, b)
+				elif kind == KEYS:
+					keys[0] = mask_keys(a)
+				else:
+					dispatch(game, level, _event(kind, a, b))
+			outcome = simulation.step(game, level, recording.dt)
+			if on_tick is not None:
+				on_tick(tick, game, level)
+			if outcome is not None:
+				break
+	finally:
+		input_source.set_mouse_source(None)
+		input_source.set_keys_source(None)
+	return game, level, outcome, time.perf_counter() - start
+
+
+def main(argv=None):
+	import argparse
+
+	parser = argparse.ArgumentParser(description="Rejouer une partie enregistrée (MMA_RECORD) sans affichage")
+	parser.add_argument("path")
+	parser.add_argument("--repeat", type=int, default=1, help="nombre de rejeux (temps médian affiché)")
+	parser.add_argument("--checksums", help="écrire l'empreinte de chaque pas du premier rejeu (voir checksum)")
+	args = parser.parse_args(argv)
+
+	recording = Recording.load(args.path)
+	print(f"{recording.level}: graine {recording.seed}, {recording.ticks} pas de {recording.dt * 1000:.0f} ms, "
+		f"{len(recording.records)} enregistrements")
+	times = []
+	for i in range(args.repeat):
+		on_tick = None
+		if args.checksums and i == 0:
+			import checksum
+			sums = checksum.ChecksumWriter(args.checksums)
+			on_tick = lambda tick, game, level: sums.write(game, level)
+		game, level, outcome, wall = play(recording, on_tick)
+		if on_tick is not None:
+			sums.close()
+		times.append(wall)
+	times.sort()
+	print(f"  issue {outcome or 'interrompue'}  vies {game.half_lives}  munitions {game.ammo}  "
+		f"cibles {len(level.targets)}  balles {len(level.bullets)}")
+	print(f"  {times[len(times) // 2] * 1000:.1f} ms par rejeu (min {times[0] * 1000:.1f})")
+	pygame.quit()
+
+
+if __name__ == "__main__":
+	main(sys.argv[1:])
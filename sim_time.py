@@ -0,0 +1,24 @@
+# Horloge de simulation (en ms), avancée uniquement par les pas de simulation.
+# Les niveaux lisent get_ticks() ici plutôt que pygame.time.get_ticks(): les cooldowns
+# restent synchronisés avec la simulation quelle que soit la durée réelle des frames.
+
+# départ décalé: les cooldowns initialisés à 0 sont prêts dès l'apparition des ennemis,
+# comme lorsqu'ils lisaient pygame.time.get_ticks() après l'écran de chargement
+START_MS = 10000.0
+
+_now_ms = START_MS
+
+
+def get_ticks():
+	return int(_now_ms)
+
+
+def advance(dt):
+	"""Avancer l'horloge de dt secondes"""
+	global _now_ms
+	_now_ms += dt * 1000.0
+
+
+def reset(start_ms=START_MS):
+	global _now_ms
+	_now_ms = float(start_ms)
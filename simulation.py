@@ -0,0 +1,36 @@
+import collisions
+import sim_time
+from frame_profiler import profiler
+
+# issue d'un pas de simulation
+DEAD = "dead"
+COMPLETED = "completed"
+
+
+def step(game, level, dt):
+	"""Avancer le joueur et le niveau d'un pas de dt secondes
+
+	Renvoie DEAD si le joueur n'a plus de vie, COMPLETED si le niveau est terminé, sinon None.
+	"""
+	sim_time.advance(dt)
+	profiler.lap("autre")
+	game.update(dt)
+	profiler.lap("game.update")
+	# Vérifier si le joueur est mort
+	if game.half_lives <= 0:
+		return DEAD
+	level.update(dt, game)
+	profiler.lap("level.update")
+
+	# gérer les balles ennemies touchant le joueur (vérification générique)
+	if hasattr(level, 'bullets'):
+		pr = collisions.player_radius(game)
+		for b in collisions.near(level.bullets, game.player_rect.centerx, game.player_rect.centery, pr, 'enemy'):
+			b.alive = False
+			game.half_lives -= 2
+			game.take_hit()
+	profiler.lap("balles ennemies")
+
+	if level.completed:
+		return COMPLETED
+	return None
@@ -0,0 +1,83 @@
+import pygame
+from pathlib import Path
+import startup_trace
+
+ASSETS = Path(__file__).parent / "assets"
+
+# nom -> (fichier, volume, voix simultanées max, couper la plus ancienne si saturé)
+SOUNDS = {
+	"gun": ("GUNPis_Coup de feu de 357 magnum 9 mm (ID 0438)_LaSonotheque.fr.mp3", 0.3, 1, True),
+	"reload": ("reload.mp3", 0.4, 1, True),
+	"hit": ("roblox-death-sound-effect.mp3", 1.0, 2, False),
+	"hitmarker": ("hitmarker_2.mp3", 0.4, 3, True),
+	"defait": ("defait.mp3", 0.5, 1, True),
+	"faaah": ("faaah.mp3", 0.6, 1, True),
+}
+
+
+class SoundBank:
+	"""Sons décodés une seule fois, joués sur des groupes de canaux réservés"""
+
+	def __init__(self, sounds=SOUNDS):
+		self.specs = sounds
+		self.sounds = {}
+		# nom -> canaux réservés à ce son
+		self.groups = {}
+		# nom -> prochain canal à couper quand le groupe est plein
+		self.next_steal = {}
+		self.loaded = False
+		self.dropped = 0
+
+	def load(self):
+		if self.loaded or not pygame.mixer.get_init():
+			return
+		total = sum(spec[2] for spec in self.specs.values())
+		# les canaux réservés ne sont jamais pris par Sound.play() ailleurs
+		pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total + 4))
+		pygame.mixer.set_reserved(total)
+		index = 0
+		for name, (filename, volume, voices, steal) in self.specs.items():
+			with startup_trace.span(f"son {name}"):
+				sound = pygame.mixer.Sound(str(ASSETS / filename))
+			sound.set_volume(volume)
+			self.sounds[name] = sound
+			self.groups[name] = [pygame.mixer.Channel(index + i) for i in range(voices)]
+			self.next_steal[name] = 0
+			index += voices
+		self.loaded = True
+
+	def play(self, name):
+		"""Jouer un son sur un canal libre de son groupe; renvoie le canal ou None"""
+		if not self.loaded:
+			self.load()
+			if not self.loaded:
+				return None
+		group = self.groups[name]
+		for channel in group:
+			if not channel.get_busy():
+				channel.play(self.sounds[name])
+				return channel
+		# groupe saturé: couper la voix la plus ancienne ou ignorer ce déclenchement
+		if not self.specs[name][3]:
+			self.dropped += 1
+			return None
+		i = self.next_steal[name]
+		self.next_steal[name] = (i + 1) % len(group)
+		group[i].stop()
+		group[i].play(self.sounds[name])
+		return group[i]
+
+	def stop(self, name):
+		for channel in self.groups.get(name, []):
+			channel.stop()
+
+	def is_playing(self, name):
+		return any(channel.get_busy() for channel in self.groups.get(name, []))
+
+
+# banque partagée par tout le jeu
+bank = SoundBank()
+
+
+def play(name):
+	return bank.play(name)
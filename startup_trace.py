@@ -0,0 +1,75 @@
+"""Trace du démarrage: durée des imports, de l'initialisation de pygame et de chaque chargement
+
+	MMA_TRACE_STARTUP=1 python main.py
+	MMA_TRACE_STARTUP=startup.json python main.py
+
+Avec 1, le détail est affiché sur stderr une fois la première frame présentée et le
+chargement initial terminé; avec un nom de fichier .json, il est aussi écrit dans ce
+fichier (pour suivre le temps jusqu'à la première frame d'une version à l'autre).
+Les temps sont comptés depuis l'import de ce module, le premier fait par main.py.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_T0 = time.perf_counter()
+
+setting = os.environ.get("MMA_TRACE_STARTUP", "")
+enabled = setting not in ("", "0")
+# (libellé, début en s depuis _T0, durée en s, thread)
+spans = []
+first_frame = None
+reported = False
+
+
+def now():
+	return time.perf_counter() - _T0
+
+
+@contextmanager
+def span(label):
+	"""Mesurer la durée du bloc (sans effet si la trace est désactivée)"""
+	if not enabled:
+		yield
+		return
+	start = now()
+	try:
+		yield
+	finally:
+		spans.append((label, start, now() - start, threading.current_thread().name))
+
+
+def mark(label):
+	"""Événement instantané"""
+	if enabled:
+		spans.append((label, now(), 0.0, threading.current_thread().name))
+
+
+def frame_presented():
+	"""À appeler après chaque flip du démarrage: retient la première frame visible"""
+	global first_frame
+	if enabled and first_frame is None:
+		first_frame = now()
+		mark("première frame")
+
+
+def report():
+	"""Afficher (et écrire en JSON si demandé) la trace, une seule fois"""
+	global reported
+	if not enabled or reported:
+		return
+	reported = True
+	print(f"{'début':>9} {'durée':>9}  {'thread':<12} étape", file=sys.stderr)
+	for label, start, duration, thread in sorted(spans, key=lambda s: s[1]):
+		print(f"{start * 1000:>7.1f}ms {duration * 1000:>7.1f}ms  {thread:<12} {label}", file=sys.stderr)
+	if first_frame is not None:
+		print(f"première frame visible après {first_frame * 1000:.1f} ms", file=sys.stderr)
+	if setting.endswith(".json"):
+		with open(setting, "w") as f:
+			json.dump({
+				"first_frame_ms": first_frame * 1000 if first_frame is not None else None,
+				"spans": [{"label": l, "start_ms": s * 1000, "duration_ms": d * 1000, "thread": t} for l, s, d, t in spans],
+			}, f, indent=2)
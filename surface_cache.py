@@ -0,0 +1,63 @@
+import pygame
+from collections import OrderedDict
+
+
+class ScaledSurfaceCache:
+	"""Cache LRU des images redimensionnées, indexé par (image, taille cible, filtre)"""
+
+	def __init__(self, max_entries=24):
+		self.max_entries = max_entries
+		self.entries = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, key, image, size, smooth=False):
+		size = (max(1, int(size[0])), max(1, int(size[1])))
+		cache_key = (key, size, smooth)
+		surf = self.entries.get(cache_key)
+		if surf is not None:
+			self.entries.move_to_end(cache_key)
+			self.hits += 1
+			return surf
+
+		self.misses += 1
+		if smooth and image.get_bitsize() >= 24:
+			surf = pygame.transform.smoothscale(image, size)
+		else:
+			surf = pygame.transform.scale(image, size)
+		self.entries[cache_key] = surf
+		# évincer les tailles les plus anciennes (ex: pendant un redimensionnement de fenêtre)
+		while len(self.entries) > self.max_entries:
+			self.entries.popitem(last=False)
+		return surf
+
+	def cover(self, key, image, screen_size, smooth=False):
+		"""Image agrandie pour couvrir tout l'écran, centrée; renvoie (surface, position)"""
+		w, h = screen_size
+		img_w, img_h = image.get_size()
+		scale = max(w / img_w, h / img_h)
+		new_w = int(img_w * scale)
+		new_h = int(img_h * scale)
+		surf = self.get(key, image, (new_w, new_h), smooth)
+		return surf, ((w - new_w) // 2, (h - new_h) // 2)
+
+	def fit(self, key, image, screen_size, ratio=1.0, smooth=True):
+		"""Image réduite pour tenir dans l'écran (multiplié par ratio), en gardant ses proportions"""
+		w, h = screen_size
+		img_w, img_h = image.get_size()
+		scale = min(w / img_w, h / img_h) * ratio
+		return self.get(key, image, (int(img_w * scale), int(img_h * scale)), smooth)
+
+	def stretch(self, key, image, screen_size, smooth=False):
+		"""Image étirée exactement à la taille de l'écran"""
+		return self.get(key, image, screen_size, smooth)
+
+	def clear(self):
+		self.entries.clear()
+
+	def memory_bytes(self):
+		return sum(s.get_pitch() * s.get_height() for s in self.entries.values())
+
+
+# cache partagé par tous les écrans
+scaled = ScaledSurfaceCache()
@@ -0,0 +1,243 @@
+"""Cinématique des cibles en tableaux NumPy
+
+Une TargetSwarm remplace la liste self.targets d'un niveau. Les objets Target
+restent (pv, image, minuteurs...), mais leur position, leur vitesse, leur rayon
+et leurs indicateurs de comportement sont rangés dans les tableaux de l'essaim:
+le guidage vers le joueur, le déplacement, les rebonds et les limites de hauteur
+se font en une opération pour toutes les cibles vivantes.
+
+L'essaim s'itère dans l'ordre d'ajout comme une liste; compact() en retire les
+cibles mortes.
+"""
+import numpy as np
+
+# attributs de Target rangés dans les tableaux de l'essaim
+COLUMNS = (
+	('x', float),
+	('y', float),
+	('vx', float),
+	('vy', float),
+	('prev_x', float),
+	('prev_y', float),
+	('radius', float),
+	('steer_strength', float),
+	# direction (unitaire) vers le joueur, recalculée quand l'IA de la cible est servie
+	('aim_x', float),
+	('aim_y', float),
+	('alive', bool),
+	('seeks_player', bool),
+	('can_shoot', bool),
+)
+
+
+def column(name):
+	"""Propriété de Target: case de la cible dans l'essaim, ou attribut _name hors essaim"""
+	private = '_' + name
+
+	def get(self):
+		swarm = self.swarm
+		if swarm is None:
+			return getattr(self, private)
+		return getattr(swarm, name)[self.slot]
+
+	def set(self, value):
+		swarm = self.swarm
+		if swarm is None:
+			setattr(self, private, value)
+		else:
+			getattr(swarm, name)[self.slot] = value
+	return property(get, set)
+
+
+class TargetSwarm:
+	def __init__(self, capacity=16):
+		self.items = []
+		self.capacity = capacity
+		for name, dtype in COLUMNS:
+			setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+	def _grow(self, capacity):
+		n = len(self.items)
+		for name, dtype in COLUMNS:
+			grown = np.zeros(capacity, dtype=dtype)
+			grown[:n] = getattr(self, name)[:n]
+			setattr(self, name, grown)
+		self.capacity = capacity
+
+	def append(self, target):
+		if target.swarm is not None:
+			raise ValueError("cette cible est déjà dans un essaim")
+		i = len(self.items)
+		if i == self.capacity:
+			self._grow(self.capacity * 2)
+		# sans position précédente, l'interpolation part de la position actuelle
+		if target._prev_x is None:
+			target._prev_x = target._x
+			target._prev_y = target._y
+		for name, _ in COLUMNS:
+			getattr(self, name)[i] = getattr(target, '_' + name)
+		target.swarm = self
+		target.slot = i
+		self.items.append(target)
+
+	def _detach(self, target):
+		"""Recopier l'état de la cible dans l'objet avant de la sortir de l'essaim"""
+		for name, _ in COLUMNS:
+			value = getattr(self, name)[target.slot]
+			setattr(target, '_' + name, value.item())
+		target.swarm = None
+		target.slot = None
+
+	def remove(self, target):
+		if target.swarm is not self:
+			raise ValueError("cette cible n'est pas dans l'essaim")
+		i = target.slot
+		n = len(self.items)
+		self._detach(target)
+		for name, _ in COLUMNS:
+			arr = getattr(self, name)
+			arr[i:n - 1] = arr[i + 1:n]
+		del self.items[i]
+		for j in range(i, n - 1):
+			self.items[j].slot = j
+
+	def clear(self):
+		for t in self.items:
+			self._detach(t)
+		self.items = []
+
+	def compact(self):
+		"""Retirer les cibles mortes, en gardant l'ordre des autres"""
+		n = len(self.items)
+		keep = self.alive[:n].copy()
+		if keep.all():
+			return
+		for t, k in zip(self.items, keep.tolist()):
+			if not k:
+				self._detach(t)
+		m = int(keep.sum())
+		for name, _ in COLUMNS:
+			arr = getattr(self, name)
+			arr[:m] = arr[:n][keep]
+		self.items = [t for t in self.items if t.swarm is self]
+		for j, t in enumerate(self.items):
+			t.slot = j
+
+	def __len__(self):
+		return len(self.items)
+
+	def __iter__(self):
+		return iter(self.items)
+
+	def __getitem__(self, i):
+		return self.items[i]
+
+	def __bool__(self):
+		return bool(self.items)
+
+	def _live(self):
+		return np.flatnonzero(self.alive[:len(self.items)])
+
+	def retarget(self, player_x, player_y, min_dist=0.0, served=None):
+		"""Viser le joueur: direction des cibles served (toutes par défaut) qui le cherchent
+
+		La direction est nulle à moins de min_dist du joueur.
+		"""
+		n = len(self.items)
+		wanted = self.alive[:n] & self.seeks_player[:n]
+		if served is None:
+			idx = np.flatnonzero(wanted)
+		else:
+			idx = served[wanted[served]]
+		if not len(idx):
+			return
+		dx = player_x - self.x[idx]
+		dy = player_y - self.y[idx]
+		dist = np.sqrt(dx * dx + dy * dy)
+		far = dist > min_dist
+		self.aim_x[idx[~far]] = 0.0
+		self.aim_y[idx[~far]] = 0.0
+		self.aim_x[idx[far]] = dx[far] / dist[far]
+		self.aim_y[idx[far]] = dy[far] / dist[far]
+
+	def steer(self, dt):
+		"""Infléchir la vitesse des cibles vivantes qui cherchent le joueur, vers leur direction visée"""
+		n = len(self.items)
+		idx = np.flatnonzero(self.alive[:n] & self.seeks_player[:n])
+		steer = self.steer_strength[idx]
+		self.vx[idx] += self.aim_x[idx] * steer * dt
+		self.vy[idx] += self.aim_y[idx] * steer * dt
+
+	def seek(self, dt, player_x, player_y, min_dist=0.0, served=None):
+		"""Viser le joueur (cibles served seulement, voir ai_scheduler) puis infléchir les vitesses"""
+		self.retarget(player_x, player_y, min_dist, served)
+		self.steer(dt)
+
+	def integrate(self, dt):
+		idx = self._live()
+		self.x[idx] += self.vx[idx] * dt
+		self.y[idx] += self.vy[idx] * dt
+
+	def bounce(self, width, height):
+		"""Rebond sur les bords de l'écran (comme Target.update)"""
+		idx = self._live()
+		x = self.x[idx]
+		y = self.y[idx]
+		r = self.radius[idx]
+		out = idx[(x - r < 0) | (x + r > width)]
+		if len(out):
+			self.vx[out] *= -1
+			self.x[out] = np.maximum(self.radius[out], np.minimum(width - self.radius[out], self.x[out]))
+		out = idx[(y - r < 0) | (y + r > height)]
+		if len(out):
+			self.vy[out] *= -1
+			self.y[out] = np.maximum(self.radius[out], np.minimum(height - self.radius[out], self.y[out]))
+
+	def step(self, dt, width, height, player_x=None, player_y=None, served=None):
+		"""Target.update pour toutes les cibles vivantes (seules les cibles served visent à nouveau)"""
+		if player_x is not None and player_y is not None:
+			self.seek(dt, player_x, player_y, served=served)
+		self.integrate(dt)
+		self.bounce(width, height)
+
+	def shooters(self, served=None):
+		"""Cibles vivantes capables de tirer (parmi served si donné), dans l'ordre"""
+		n = len(self.items)
+		shooting = self.alive[:n] & self.can_shoot[:n]
+		if served is None:
+			idx = np.flatnonzero(shooting)
+		else:
+			idx = served[shooting[served]]
+		return [self.items[i] for i in idx.tolist()]
+
+	def limit_shooters(self, max_y, rebound=-0.4):
+		"""Empêcher les tireurs (tank, boss) de descendre sous max_y; ils repartent vers le haut"""
+		n = len(self.items)
+		idx = np.flatnonzero(self.alive[:n] & self.can_shoot[:n])
+		low = idx[self.y[idx] > max_y]
+		if not len(low):
+			return
+		self.y[low] = max_y
+		down = low[self.vy[low] > 0]
+		self.vy[down] *= rebound
+
+	def clamp(self, width, max_y):
+		"""Garder les cibles vivantes dans [r, width - r] x [r, max_y], sans rebond"""
+		idx = self._live()
+		r = self.radius[idx]
+		self.x[idx] = np.maximum(r, np.minimum(width - r, self.x[idx]))
+		self.y[idx] = np.maximum(r, np.minimum(max_y, self.y[idx]))
+
+	def save_positions(self):
+		"""Équivalent de fixed_step.save_positions pour toutes les cibles"""
+		n = len(self.items)
+		self.prev_x[:n] = self.x[:n]
+		self.prev_y[:n] = self.y[:n]
+
+	def near(self, x, y, radius):
+		"""Cibles (mortes comprises) dont le cercle touche le cercle (x, y, radius)"""
+		n = len(self.items)
+		dx = self.x[:n] - x
+		dy = self.y[:n] - y
+		r = self.radius[:n] + radius
+		return [self.items[i] for i in np.flatnonzero(dx * dx + dy * dy <= r * r).tolist()]
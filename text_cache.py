@@ -0,0 +1,40 @@
+import pygame
+from collections import OrderedDict
+from pathlib import Path
+
+ASSETS = Path(__file__).parent / "assets"
+FONT_PATH = ASSETS / "ARCADECLASSIC.TTF"
+
+# taille -> Font (le fichier TTF n'est lu qu'une fois par taille)
+_fonts = {}
+# (texte, taille, couleur, antialias) -> Surface rendue
+_texts = OrderedDict()
+MAX_TEXTS = 256
+
+
+def font(size):
+	f = _fonts.get(size)
+	if f is None:
+		f = pygame.font.Font(str(FONT_PATH), size)
+		_fonts[size] = f
+	return f
+
+
+def render(text, size, color, antialias=True):
+	"""Texte rendu avec la police du jeu, réutilisé tant que son contenu ne change pas"""
+	key = (text, size, tuple(color), antialias)
+	surf = _texts.get(key)
+	if surf is not None:
+		_texts.move_to_end(key)
+		return surf
+	surf = font(size).render(text, antialias, color)
+	_texts[key] = surf
+	# borner le cache pour les textes qui changent souvent (compteurs, points de chargement)
+	while len(_texts) > MAX_TEXTS:
+		_texts.popitem(last=False)
+	return surf
+
+
+def clear():
+	_fonts.clear()
+	_texts.clear()